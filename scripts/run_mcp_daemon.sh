@@ -59,13 +59,13 @@ check_enhanced_dependencies() {
         # 检查 ChromaDB
         if ! python -c "import chromadb" 2>/dev/null; then
             echo "警告: ChromaDB 未安装，正在安装..."
-            pip install chromadb sentence-transformers beautifulsoup4 psutil
+            pip install chromadb sentence-transformers selectolax psutil xxhash aiodns
         fi
 
         # 检查其他依赖
-        if ! python -c "import sentence_transformers, bs4, psutil" 2>/dev/null; then
+        if ! python -c "import sentence_transformers, selectolax, psutil, xxhash, aiodns" 2>/dev/null; then
             echo "警告: 增强功能依赖不完整，正在安装..."
-            pip install sentence-transformers beautifulsoup4 psutil
+            pip install sentence-transformers selectolax psutil xxhash aiodns
         fi
 
         echo "✅ 增强功能依赖检查完成"
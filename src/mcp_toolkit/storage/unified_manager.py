@@ -9,7 +9,7 @@ import json
 import os
 import time
 import uuid
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
 import chromadb
 from chromadb.config import Settings
@@ -117,6 +117,62 @@ class UnifiedDataManager:
 
         return data_id
 
+    def store_data_batch(
+        self,
+        data_type: str,
+        contents: Sequence[str],
+        metadatas: Sequence[Dict[str, Any]],
+        data_ids: Optional[Sequence[Optional[str]]] = None,
+    ) -> List[str]:
+        """批量数据存储接口，一次调用写入多条数据
+
+        Args:
+            data_type: 数据类型 (file, task, config, memory, knowledge)
+            contents: 文档内容列表
+            metadatas: 与内容一一对应的元数据列表
+            data_ids: 可选的数据ID列表，缺省项自动生成
+
+        Returns:
+            List[str]: 与输入顺序一致的数据ID列表
+        """
+        if len(contents) != len(metadatas):
+            raise ValueError("contents 与 metadatas 长度不一致")
+        if data_ids is None:
+            data_ids = [None] * len(contents)
+        elif len(data_ids) != len(contents):
+            raise ValueError("data_ids 与 contents 长度不一致")
+
+        ids = [data_id or f"{data_type}_{uuid.uuid4()}" for data_id in data_ids]
+
+        # 同一批次内重复的ID只保留最后一条，与逐条 store_data 的覆盖语义一致
+        current_time = time.time()
+        batch: Dict[str, Any] = {}
+        for data_id, content, metadata in zip(ids, contents, metadatas):
+            batch[data_id] = (
+                content,
+                {
+                    "data_type": data_type,
+                    "created_time": current_time,
+                    "updated_time": current_time,
+                    **metadata,
+                },
+            )
+
+        if batch:
+            try:
+                # 先删除已存在的记录再添加，整体替换元数据（upsert 会与旧元数据合并）
+                batch_ids = list(batch)
+                self.collection.delete(ids=batch_ids)
+                self.collection.add(
+                    ids=batch_ids,
+                    documents=[item[0] for item in batch.values()],
+                    metadatas=[item[1] for item in batch.values()],
+                )
+            except Exception as e:
+                raise Exception(f"批量存储数据失败: {str(e)}")
+
+        return ids
+
     def _reinitialize_database(self) -> None:
         """重新初始化数据库（简化版）"""
         try:
@@ -9,7 +9,7 @@ import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Dict, List, Optional, Type, Union
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
 
 from ..core.interfaces import ToolDefinition
 from ..core.logging import get_logger
@@ -46,7 +46,7 @@ class ResourceEstimate:
     network_requests: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class ResourceUsage:
     """实际资源使用"""
 
@@ -83,7 +83,7 @@ class ExecutionContext:
             self.permissions = []
 
 
-@dataclass
+@dataclass(slots=True)
 class ExecutionMetadata:
     """执行元数据"""
 
@@ -117,7 +117,7 @@ class ToolError(Exception):
         return f"{self.code}: {self.message}"
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolExecutionResult:
     """工具执行结果"""
 
@@ -225,6 +225,25 @@ class BaseTool(ABC):
             resources_used=resources_used,
         )
 
+    def _build_execution_stats(
+        self, start_time: float, memory_mb: float, io_operations: int = 1
+    ) -> Tuple[ExecutionMetadata, ResourceUsage]:
+        """构造执行元数据与资源使用
+
+        start_time 取自 time.monotonic()，耗时只计算一次并用于所有时间字段
+        """
+        elapsed_ms = (time.monotonic() - start_time) * 1000
+        metadata = ExecutionMetadata(
+            execution_time=elapsed_ms,
+            memory_used=memory_mb,
+            cpu_time=elapsed_ms,
+            io_operations=io_operations,
+        )
+        resources = ResourceUsage(
+            memory_mb=memory_mb, cpu_time_ms=elapsed_ms, io_operations=io_operations
+        )
+        return metadata, resources
+
     def _resolve_path(self, path: str, request: ToolExecutionRequest) -> str:
         """解析路径，考虑工作目录"""
         import os
@@ -4,8 +4,10 @@
 基于 ChromaDB 统一存储的智能上下文工具，提供代码分析、语义搜索、项目概览等功能。
 """
 
+import os
 import time
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 
 from ..context.context_engine import ContextEngine
 from ..core.interfaces import ToolDefinition
@@ -35,6 +37,10 @@ class CodeAnalysisTool(BaseTool):
         self.context_engine = ContextEngine(
             self.data_manager, self.config.get("context_engine", {})
         )
+        # 进程内已分析文件缓存: file_path -> (st_mtime, existing_context)
+        self._context_cache: OrderedDict[str, Tuple[float, Dict[str, Any]]]
+        self._context_cache = OrderedDict()
+        self._context_cache_size = self.config.get("context_cache_size", 4096)
 
     def get_definition(self) -> ToolDefinition:
         return ToolDefinition(
@@ -109,7 +115,7 @@ class CodeAnalysisTool(BaseTool):
 
             # 检查是否已存在分析结果
             if not force_reanalyze:
-                existing_context = self.context_engine.get_file_context(file_path)
+                existing_context = self._get_existing_context(file_path)
                 if existing_context.get("found"):
                     return self._create_success_result(
                         {
@@ -122,6 +128,8 @@ class CodeAnalysisTool(BaseTool):
 
             # 执行分析
             result = self.context_engine.analyze_and_store_file(file_path, content)
+            if result.get("success"):
+                self._context_cache.pop(file_path, None)
 
             execution_time = (time.time() - start_time) * 1000
 
@@ -146,6 +154,26 @@ class CodeAnalysisTool(BaseTool):
                 "ANALYSIS_ERROR", f"代码分析失败: {str(e)}"
             )
 
+    def _get_existing_context(self, file_path: str) -> Dict[str, Any]:
+        """获取已有分析结果，文件未修改时直接命中进程内缓存"""
+        try:
+            mtime = os.stat(file_path).st_mtime
+        except OSError:
+            return self.context_engine.get_file_context(file_path)
+
+        cached = self._context_cache.get(file_path)
+        if cached is not None and cached[0] == mtime:
+            self._context_cache.move_to_end(file_path)
+            return cached[1]
+
+        existing_context = self.context_engine.get_file_context(file_path)
+        if existing_context.get("found"):
+            self._context_cache[file_path] = (mtime, existing_context)
+            self._context_cache.move_to_end(file_path)
+            if len(self._context_cache) > self._context_cache_size:
+                self._context_cache.popitem(last=False)
+        return existing_context
+
     async def cleanup(self) -> None:
         """清理资源"""
         pass
@@ -9,8 +9,7 @@ import hashlib
 import mimetypes
 import os
 import time
-from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, NamedTuple, Optional
 
 from ..core.interfaces import ToolDefinition
 from ..core.types import ConfigDict
@@ -26,6 +25,28 @@ from .base import (
 )
 
 
+def _make_preview(document: str, limit: int) -> str:
+    """截取内容预览，仅在截断时追加省略号"""
+    preview = document[:limit]
+    return preview + "..." if len(preview) < len(document) else preview
+
+
+class _FileMeta(NamedTuple):
+    """单次解析得到的文件路径与状态信息"""
+
+    abspath: str
+    st: os.stat_result
+    ext: str
+
+    @classmethod
+    def from_path(cls, file_path: str, st: os.stat_result) -> "_FileMeta":
+        abspath = os.path.abspath(file_path)
+        basename = os.path.basename(abspath)
+        dot = basename.rfind(".")
+        ext = basename[dot:] if 0 < dot < len(basename) - 1 else ""
+        return cls(abspath=abspath, st=st, ext=ext)
+
+
 class EnhancedFileReader(BaseTool):
     """增强的文件读取工具 - 支持 ChromaDB 存储"""
 
@@ -118,23 +139,23 @@ class EnhancedFileReader(BaseTool):
         try:
             start_time = time.time()
 
-            # 读取文件内容
+            # 读取文件内容，并复用已打开的文件描述符获取状态
             with open(file_path, "r", encoding=encoding) as f:
                 content = f.read()
+                file_meta = _FileMeta.from_path(file_path, os.fstat(f.fileno()))
 
             # 提取文件元数据
-            file_stat = os.stat(file_path)
             file_info = {
-                "path": os.path.abspath(file_path),
-                "size": file_stat.st_size,
-                "modified_time": file_stat.st_mtime,
-                "created_time": file_stat.st_ctime,
-                "extension": Path(file_path).suffix,
-                "mime_type": mimetypes.guess_type(file_path)[0] or "text/plain",
+                "path": file_meta.abspath,
+                "size": file_meta.st.st_size,
+                "modified_time": file_meta.st.st_mtime,
+                "created_time": file_meta.st.st_ctime,
+                "extension": file_meta.ext,
+                "mime_type": mimetypes.guess_type(file_meta.abspath)[0] or "text/plain",
             }
 
             # 检测编程语言
-            language = self._detect_language(file_path)
+            language = self._detect_language(file_meta)
             if language:
                 file_info["language"] = language
 
@@ -206,7 +227,7 @@ class EnhancedFileReader(BaseTool):
             self._logger.exception("读取文件时发生异常")
             return self._create_error_result("READ_ERROR", f"读取文件失败: {str(e)}")
 
-    def _detect_language(self, file_path: str) -> Optional[str]:
+    def _detect_language(self, file_meta: _FileMeta) -> Optional[str]:
         """检测编程语言"""
         ext_map = {
             ".py": "python",
@@ -241,8 +262,7 @@ class EnhancedFileReader(BaseTool):
             ".txt": "text",
         }
 
-        ext = Path(file_path).suffix.lower()
-        return ext_map.get(ext)
+        return ext_map.get(file_meta.ext.lower())
 
     async def cleanup(self) -> None:
         """清理资源"""
@@ -311,27 +331,27 @@ class FileSearchTool(BaseTool):
                 n_results=max_results,
             )
 
-            # 处理搜索结果
-            search_results = []
-            if results["ids"] and results["ids"][0]:
-                for i, doc_id in enumerate(results["ids"][0]):
-                    result_item = {
+            # 处理搜索结果：一次性绑定各结果列表，按行并行遍历
+            search_results: List[Dict[str, Any]] = []
+            ids = results["ids"][0] if results["ids"] else []
+            if ids:
+                metadatas = results["metadatas"][0]
+                documents = results["documents"][0]
+                distances = results["distances"][0]
+                scores = [1 - d for d in distances] if distances else [0] * len(ids)
+                search_results = [
+                    {
                         "id": doc_id,
-                        "file_path": results["metadatas"][0][i].get("file_path", ""),
-                        "language": results["metadatas"][0][i].get("language", ""),
-                        "file_size": results["metadatas"][0][i].get("file_size", 0),
-                        "similarity_score": (
-                            1 - results["distances"][0][i]
-                            if results["distances"][0]
-                            else 0
-                        ),
-                        "content_preview": (
-                            results["documents"][0][i][:200] + "..."
-                            if len(results["documents"][0][i]) > 200
-                            else results["documents"][0][i]
-                        ),
+                        "file_path": meta.get("file_path", ""),
+                        "language": meta.get("language", ""),
+                        "file_size": meta.get("file_size", 0),
+                        "similarity_score": score,
+                        "content_preview": _make_preview(document, 200),
                     }
-                    search_results.append(result_item)
+                    for doc_id, meta, score, document in zip(
+                        ids, metadatas, scores, documents
+                    )
+                ]
 
             execution_time = (time.time() - start_time) * 1000
 
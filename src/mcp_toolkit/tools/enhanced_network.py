@@ -6,13 +6,18 @@
 """
 
 import asyncio
-import hashlib
+import os
+import re
+import socket
 import time
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import urlparse
 
 import aiohttp
-from bs4 import BeautifulSoup
+import xxhash
+from selectolax.lexbor import LexborHTMLParser
 
 from ..core.interfaces import ToolDefinition
 from ..core.types import ConfigDict
@@ -27,10 +32,129 @@ from .base import (
     ValidationResult,
 )
 
+# 结果缓存键: (url, extract_text, include_metadata, 是否存储, user_agent)
+_CacheKey = Tuple[str, bool, bool, bool, str]
+
+# 待写入 ChromaDB 的条目: (data_id, content, metadata, 写入完成后回填ID的 future)
+_StoreItem = Tuple[str, str, Dict[str, Any], "asyncio.Future[str]"]
+
+# HTML 解析进程池（首次使用时创建）
+_PARSE_WORKERS = os.cpu_count() or 1
+_PARSE_POOL: Optional[ProcessPoolExecutor] = None
+
+# 小于该长度的页面直接在当前进程解析，避免进程间传输的开销
+_INLINE_PARSE_MAX_CHARS = 64 * 1024
+
+# 流式读取响应体的分块大小
+_READ_CHUNK_SIZE = 64 * 1024
+
+# 连续空白字符，用于将提取的文本规范化为单空格分隔
+_WS_RE = re.compile(r"\s+")
+
+
+def _get_parse_pool() -> ProcessPoolExecutor:
+    """获取共享的 HTML 解析进程池"""
+    global _PARSE_POOL
+    if _PARSE_POOL is None:
+        _PARSE_POOL = ProcessPoolExecutor(max_workers=_PARSE_WORKERS)
+    return _PARSE_POOL
+
+
+def _shutdown_parse_pool() -> None:
+    """关闭 HTML 解析进程池，下次使用时重新创建
+
+    先解除全局引用，新的解析任务会提交到新建的进程池；已提交的任务仍会完成。
+    该函数会等待进程池退出，应在工作线程中调用。
+    """
+    global _PARSE_POOL
+    pool, _PARSE_POOL = _PARSE_POOL, None
+    if pool is not None:
+        pool.shutdown(wait=True)
+
+
+def _parse_html(
+    html_content: str, extract_text: bool, include_metadata: bool
+) -> Dict[str, Any]:
+    """解析HTML，提取标题、元数据标签和纯文本
+
+    纯函数，可在解析进程池中执行。
+    """
+    tree = LexborHTMLParser(html_content)
+    title_node = tree.css_first("title")
+    parsed: Dict[str, Any] = {
+        "title": title_node.text(strip=True) if title_node else "",
+        "meta_tags": None,
+        "text_content": "",
+    }
+
+    # 提取元数据
+    if include_metadata:
+        meta_tags = {}
+        for meta in tree.css("meta"):
+            attrs = meta.attributes
+            name = attrs.get("name") or attrs.get("property")
+            content = attrs.get("content")
+            if name and content:
+                meta_tags[name] = content
+        parsed["meta_tags"] = meta_tags
+
+    # 提取纯文本内容
+    if extract_text:
+        # 移除脚本和样式标签（单次原生调用完成）
+        tree.strip_tags(["script", "style"])
+        root = tree.root
+        text_content = root.text(separator=" ", strip=True) if root else ""
+        # 清理文本：合并所有连续空白
+        parsed["text_content"] = _WS_RE.sub(" ", text_content).strip()
+
+    return parsed
+
+
+# 工具定义与实例无关，模块加载时构建一次，get_definition() 直接复用
+_ENHANCED_FETCH_WEB_DEF = ToolDefinition(
+    name="enhanced_fetch_web",
+    description="获取网页内容并可选择存储到 ChromaDB 进行语义搜索",
+    parameters={
+        "type": "object",
+        "properties": {
+            "url": {"type": "string", "description": "要获取的网页URL"},
+            "extract_text": {
+                "type": "boolean",
+                "default": True,
+                "description": "是否提取纯文本内容",
+            },
+            "store_to_chromadb": {
+                "type": "boolean",
+                "default": True,
+                "description": "是否将内容存储到 ChromaDB",
+            },
+            "include_metadata": {
+                "type": "boolean",
+                "default": True,
+                "description": "是否包含页面元数据",
+            },
+            "user_agent": {
+                "type": "string",
+                "default": "MCP-Toolkit/1.0",
+                "description": "HTTP User-Agent",
+            },
+        },
+        "required": ["url"],
+    },
+)
+
 
 class EnhancedWebFetcher(BaseTool):
     """增强的网页获取工具 - 支持 ChromaDB 存储"""
 
+    # 通用请求头，User-Agent 按请求单独设置
+    DEFAULT_HEADERS = {
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+        "Accept-Language": "en-US,en;q=0.5",
+        "Accept-Encoding": "gzip, deflate",
+        "Connection": "keep-alive",
+    }
+
     def __init__(
         self,
         config: Optional[ConfigDict] = None,
@@ -42,38 +166,29 @@ class EnhancedWebFetcher(BaseTool):
         self.max_content_size = self.config.get("max_content_size_mb", 5) * 1024 * 1024
         self.auto_store = self.config.get("auto_store_to_chromadb", True)
 
+        # 共享 HTTP 会话，首次请求时创建以复用连接池和 keep-alive
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_lock = asyncio.Lock()
+        # 限制本实例同时排队等待进程池解析的页面数
+        self._parse_slots = asyncio.BoundedSemaphore(_PARSE_WORKERS * 2)
+        self.dns_cache_ttl = self.config.get("dns_cache_ttl", 600)
+        # 仅解析 IPv4 地址，避免 IPv6 不可达时双栈解析的超时等待
+        self.ipv4_only = self.config.get("ipv4_only", False)
+
+        # ChromaDB 写入队列，由后台任务合并为批量写入
+        self.store_batch_size = self.config.get("store_batch_size", 100)
+        self._store_queue: Optional[asyncio.Queue[_StoreItem]] = None
+        self._store_task: Optional[asyncio.Task[None]] = None
+
+        # 短期结果缓存（LRU + TTL），以及正在获取中的请求（合并并发的相同请求）
+        self.result_cache_size = self.config.get("result_cache_size", 1024)
+        self.result_cache_ttl = self.config.get("result_cache_ttl", 300)
+        self._result_cache: OrderedDict[_CacheKey, Tuple[float, Any]]
+        self._result_cache = OrderedDict()
+        self._inflight: Dict[_CacheKey, "asyncio.Future[ToolExecutionResult]"] = {}
+
     def get_definition(self) -> ToolDefinition:
-        return ToolDefinition(
-            name="enhanced_fetch_web",
-            description="获取网页内容并可选择存储到 ChromaDB 进行语义搜索",
-            parameters={
-                "type": "object",
-                "properties": {
-                    "url": {"type": "string", "description": "要获取的网页URL"},
-                    "extract_text": {
-                        "type": "boolean",
-                        "default": True,
-                        "description": "是否提取纯文本内容",
-                    },
-                    "store_to_chromadb": {
-                        "type": "boolean",
-                        "default": True,
-                        "description": "是否将内容存储到 ChromaDB",
-                    },
-                    "include_metadata": {
-                        "type": "boolean",
-                        "default": True,
-                        "description": "是否包含页面元数据",
-                    },
-                    "user_agent": {
-                        "type": "string",
-                        "default": "MCP-Toolkit/1.0",
-                        "description": "HTTP User-Agent",
-                    },
-                },
-                "required": ["url"],
-            },
-        )
+        return _ENHANCED_FETCH_WEB_DEF
 
     def validate_parameters(self, params: Dict[str, Any]) -> ValidationResult:
         """验证参数"""
@@ -103,7 +218,87 @@ class EnhancedWebFetcher(BaseTool):
         return ValidationResult(is_valid=len(errors) == 0, errors=errors)
 
     async def execute(self, request: ToolExecutionRequest) -> ToolExecutionResult:
-        """执行网页获取"""
+        """执行网页获取（命中缓存或合并到进行中的相同请求时不再重复获取）"""
+        params = request.parameters
+        cache_key: _CacheKey = (
+            params["url"],
+            params.get("extract_text", True),
+            params.get("include_metadata", True),
+            bool(params.get("store_to_chromadb", True) and self.auto_store),
+            params.get("user_agent", "MCP-Toolkit/1.0"),
+        )
+        start_time = time.time()
+
+        while True:
+            cached = self._get_cached_content(cache_key)
+            if cached is not None:
+                return self._cache_hit_result(cached, start_time)
+
+            pending = self._inflight.get(cache_key)
+            if pending is None:
+                break
+            try:
+                result = await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # 发起请求的任务被取消，重新检查后自行获取
+                continue
+            if not result.success:
+                return result
+            return self._cache_hit_result(result.content, start_time)
+
+        future: asyncio.Future[ToolExecutionResult]
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = future
+        try:
+            result = await self._fetch(request)
+        except BaseException:
+            future.cancel()
+            raise
+        else:
+            content: Any = result.content
+            if result.success and "chromadb_error" not in content:
+                self._put_cached_content(cache_key, content)
+            future.set_result(result)
+            return result
+        finally:
+            del self._inflight[cache_key]
+
+    def _get_cached_content(self, cache_key: _CacheKey) -> Any:
+        """读取未过期的缓存结果"""
+        cached = self._result_cache.get(cache_key)
+        if cached is None:
+            return None
+        if time.monotonic() - cached[0] > self.result_cache_ttl:
+            del self._result_cache[cache_key]
+            return None
+        self._result_cache.move_to_end(cache_key)
+        return cached[1]
+
+    def _put_cached_content(self, cache_key: _CacheKey, content: Any) -> None:
+        """写入缓存结果，超出容量时淘汰最久未使用的条目"""
+        if self.result_cache_size <= 0:
+            return
+        self._result_cache[cache_key] = (time.monotonic(), content)
+        self._result_cache.move_to_end(cache_key)
+        if len(self._result_cache) > self.result_cache_size:
+            self._result_cache.popitem(last=False)
+
+    def _cache_hit_result(self, content: Any, start_time: float) -> ToolExecutionResult:
+        """基于已有结果创建缓存命中的执行结果"""
+        execution_time = (time.time() - start_time) * 1000
+        metadata = ExecutionMetadata(
+            execution_time=execution_time,
+            memory_used=0.0,
+            cpu_time=execution_time * 0.1,
+            io_operations=0,
+            cache_hit=True,
+        )
+        return self._create_success_result(content, metadata)
+
+    async def _fetch(self, request: ToolExecutionRequest) -> ToolExecutionResult:
+        """获取、解析并存储网页"""
         params = request.parameters
         url = params["url"]
         extract_text = params.get("extract_text", True)
@@ -115,74 +310,54 @@ class EnhancedWebFetcher(BaseTool):
             start_time = time.time()
 
             # 设置请求头
-            headers = {
-                "User-Agent": user_agent,
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-                "Accept-Language": "en-US,en;q=0.5",
-                "Accept-Encoding": "gzip, deflate",
-                "Connection": "keep-alive",
-            }
+            headers = {**self.DEFAULT_HEADERS, "User-Agent": user_agent}
 
             # 发送HTTP请求
-            async with aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=self.timeout)
-            ) as session:
-                async with session.get(url, headers=headers) as response:
-                    if response.status != 200:
-                        return self._create_error_result(
-                            "HTTP_ERROR", f"HTTP请求失败，状态码: {response.status}"
-                        )
+            session = await self._get_session()
+            async with session.get(url, headers=headers) as response:
+                if response.status != 200:
+                    return self._create_error_result(
+                        "HTTP_ERROR", f"HTTP请求失败，状态码: {response.status}"
+                    )
 
-                    content_length = response.headers.get("content-length")
-                    if content_length and int(content_length) > self.max_content_size:
-                        return self._create_error_result(
-                            "CONTENT_TOO_LARGE",
-                            f"内容过大，超过 {self.max_content_size / 1024 / 1024}MB 限制",
-                        )
+                content_length = response.headers.get("content-length")
+                if content_length and int(content_length) > self.max_content_size:
+                    return self._content_too_large_result()
 
-                    html_content = await response.text()
+                # 流式读取响应体，超过大小限制时立即中止（不依赖 content-length）
+                body = bytearray()
+                async for chunk in response.content.iter_chunked(_READ_CHUNK_SIZE):
+                    body.extend(chunk)
+                    if len(body) > self.max_content_size:
+                        return self._content_too_large_result()
+
+                charset = response.charset or "utf-8"
+                try:
+                    html_content = body.decode(charset, errors="replace")
+                except LookupError:
+                    html_content = body.decode("utf-8", errors="replace")
+                body_size = len(body)
+                del body
 
             # 解析HTML内容
-            soup = BeautifulSoup(html_content, "html.parser")
+            parsed = await self._parse_page(
+                html_content, extract_text, include_metadata
+            )
 
             # 提取页面信息
             page_info = {
                 "url": url,
-                "title": (
-                    soup.title.string.strip()
-                    if soup.title and soup.title.string
-                    else ""
-                ),
+                "title": parsed["title"],
                 "content_length": len(html_content),
                 "status_code": response.status,
                 "content_type": response.headers.get("content-type", ""),
                 "fetch_time": time.time(),
             }
 
-            # 提取元数据
             if include_metadata:
-                meta_tags = {}
-                for meta in soup.find_all("meta"):
-                    if hasattr(meta, "get"):  # 确保是 Tag 对象
-                        name = meta.get("name") or meta.get("property")
-                        content = meta.get("content")
-                        if name and content:
-                            meta_tags[name] = content
-                page_info["meta_tags"] = meta_tags
-
-            # 提取纯文本内容
-            text_content = ""
-            if extract_text:
-                # 移除脚本和样式标签
-                for script in soup(["script", "style"]):
-                    script.decompose()
-                text_content = soup.get_text()
-                # 清理文本
-                lines = (line.strip() for line in text_content.splitlines())
-                chunks = (
-                    phrase.strip() for line in lines for phrase in line.split("  ")
-                )
-                text_content = " ".join(chunk for chunk in chunks if chunk)
+                page_info["meta_tags"] = parsed["meta_tags"]
+
+            text_content = parsed["text_content"]
 
             result_content = {
                 "url": url,
@@ -196,10 +371,8 @@ class EnhancedWebFetcher(BaseTool):
             # 存储到 ChromaDB
             if store_to_chromadb and self.auto_store:
                 try:
-                    # 使用文本内容生成哈希
-                    content_hash = hashlib.md5(
-                        text_content.encode(), usedforsecurity=False
-                    ).hexdigest()
+                    # 使用文本内容生成去重哈希（非安全用途，使用 XXH3-128）
+                    content_hash = xxhash.xxh3_128_hexdigest(text_content.encode())
                     data_id = f"web_{content_hash}"
 
                     # 准备存储的内容（优先使用文本内容）
@@ -224,11 +397,8 @@ class EnhancedWebFetcher(BaseTool):
                         if keywords:
                             metadata["keywords"] = keywords
 
-                    stored_id = self.data_manager.store_data(
-                        data_type="web_content",
-                        content=storage_content,
-                        metadata=metadata,
-                        data_id=data_id,
+                    stored_id = await self._enqueue_store(
+                        data_id, storage_content, metadata
                     )
 
                     result_content["chromadb_id"] = stored_id
@@ -242,13 +412,13 @@ class EnhancedWebFetcher(BaseTool):
 
             exec_metadata = ExecutionMetadata(
                 execution_time=execution_time,
-                memory_used=len(html_content) / 1024 / 1024,
+                memory_used=body_size / 1024 / 1024,
                 cpu_time=execution_time * 0.1,
                 io_operations=1,
             )
 
             resources = ResourceUsage(
-                memory_mb=len(html_content) / 1024 / 1024,
+                memory_mb=body_size / 1024 / 1024,
                 cpu_time_ms=execution_time * 0.1,
                 io_operations=1,
             )
@@ -265,9 +435,131 @@ class EnhancedWebFetcher(BaseTool):
             self._logger.exception("获取网页时发生异常")
             return self._create_error_result("FETCH_ERROR", f"获取网页失败: {str(e)}")
 
+    def _content_too_large_result(self) -> ToolExecutionResult:
+        """创建内容超出大小限制的错误结果"""
+        return self._create_error_result(
+            "CONTENT_TOO_LARGE",
+            f"内容过大，超过 {self.max_content_size / 1024 / 1024}MB 限制",
+        )
+
+    async def _parse_page(
+        self, html_content: str, extract_text: bool, include_metadata: bool
+    ) -> Dict[str, Any]:
+        """解析页面，较大的页面交给进程池以免阻塞事件循环"""
+        if len(html_content) <= _INLINE_PARSE_MAX_CHARS:
+            return _parse_html(html_content, extract_text, include_metadata)
+
+        async with self._parse_slots:
+            return await asyncio.get_running_loop().run_in_executor(
+                _get_parse_pool(),
+                _parse_html,
+                html_content,
+                extract_text,
+                include_metadata,
+            )
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """获取共享的 HTTP 会话"""
+        if self._session is not None and not self._session.closed:
+            return self._session
+
+        async with self._session_lock:
+            if self._session is None or self._session.closed:
+                self._session = aiohttp.ClientSession(
+                    timeout=aiohttp.ClientTimeout(total=self.timeout),
+                    connector=aiohttp.TCPConnector(
+                        resolver=aiohttp.AsyncResolver(),
+                        family=socket.AF_INET if self.ipv4_only else socket.AF_UNSPEC,
+                        limit=100,
+                        limit_per_host=10,
+                        ttl_dns_cache=self.dns_cache_ttl,
+                    ),
+                )
+            return self._session
+
+    async def _enqueue_store(
+        self, data_id: str, content: str, metadata: Dict[str, Any]
+    ) -> str:
+        """将网页内容加入写入队列，等待所在批次写入完成后返回数据ID"""
+        queue = self._store_queue
+        if queue is None or self._store_task is None or self._store_task.done():
+            queue = self._store_queue = asyncio.Queue()
+            self._store_task = asyncio.create_task(self._store_worker(queue))
+
+        future: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+        await queue.put((data_id, content, metadata, future))
+        return await future
+
+    async def _store_worker(self, queue: "asyncio.Queue[_StoreItem]") -> None:
+        """后台写入任务：合并队列中已积压的条目，一次批量写入 ChromaDB"""
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.store_batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+
+            try:
+                stored_ids = await asyncio.to_thread(
+                    self.data_manager.store_data_batch,
+                    "web_content",
+                    [item[1] for item in batch],
+                    [item[2] for item in batch],
+                    [item[0] for item in batch],
+                )
+            except asyncio.CancelledError:
+                for item in batch:
+                    item[3].cancel()
+                raise
+            except Exception as e:
+                for item in batch:
+                    if not item[3].done():
+                        item[3].set_exception(e)
+            else:
+                for item, stored_id in zip(batch, stored_ids):
+                    if not item[3].done():
+                        item[3].set_result(stored_id)
+
     async def cleanup(self) -> None:
         """清理资源"""
-        pass
+        self._result_cache.clear()
+        if self._store_task is not None and not self._store_task.done():
+            self._store_task.cancel()
+            try:
+                await self._store_task
+            except asyncio.CancelledError:
+                pass
+        if self._store_queue is not None:
+            while not self._store_queue.empty():
+                self._store_queue.get_nowait()[3].cancel()
+        self._store_task = None
+        self._store_queue = None
+
+        # 等待进程池退出会阻塞，放到工作线程中执行
+        await asyncio.to_thread(_shutdown_parse_pool)
+
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+_SEARCH_WEB_CONTENT_DEF = ToolDefinition(
+    name="search_web_content",
+    description="在 ChromaDB 中搜索已存储的网页内容",
+    parameters={
+        "type": "object",
+        "properties": {
+            "query": {"type": "string", "description": "搜索查询文本"},
+            "domain": {"type": "string", "description": "过滤特定域名"},
+            "max_results": {
+                "type": "integer",
+                "default": 10,
+                "minimum": 1,
+                "maximum": 50,
+                "description": "最大返回结果数",
+            },
+        },
+        "required": ["query"],
+    },
+)
 
 
 class WebContentSearchTool(BaseTool):
@@ -282,25 +574,7 @@ class WebContentSearchTool(BaseTool):
         self.data_manager = data_manager or UnifiedDataManager()
 
     def get_definition(self) -> ToolDefinition:
-        return ToolDefinition(
-            name="search_web_content",
-            description="在 ChromaDB 中搜索已存储的网页内容",
-            parameters={
-                "type": "object",
-                "properties": {
-                    "query": {"type": "string", "description": "搜索查询文本"},
-                    "domain": {"type": "string", "description": "过滤特定域名"},
-                    "max_results": {
-                        "type": "integer",
-                        "default": 10,
-                        "minimum": 1,
-                        "maximum": 50,
-                        "description": "最大返回结果数",
-                    },
-                },
-                "required": ["query"],
-            },
-        )
+        return _SEARCH_WEB_CONTENT_DEF
 
     async def execute(self, request: ToolExecutionRequest) -> ToolExecutionResult:
         """执行网页内容搜索"""
@@ -325,28 +599,30 @@ class WebContentSearchTool(BaseTool):
                 n_results=max_results,
             )
 
-            # 处理搜索结果
-            search_results = []
-            if results["ids"] and results["ids"][0]:
-                for i, doc_id in enumerate(results["ids"][0]):
-                    result_item = {
+            # 处理搜索结果：一次性绑定各结果列表，按行并行遍历
+            search_results: List[Dict[str, Any]] = []
+            ids = results["ids"][0] if results["ids"] else []
+            if ids:
+                metadatas = results["metadatas"][0]
+                documents = results["documents"][0]
+                distances = results["distances"][0]
+                scores = [1 - d for d in distances] if distances else [0] * len(ids)
+                search_results = [
+                    {
                         "id": doc_id,
-                        "url": results["metadatas"][0][i].get("url", ""),
-                        "title": results["metadatas"][0][i].get("title", ""),
-                        "domain": results["metadatas"][0][i].get("domain", ""),
-                        "similarity_score": (
-                            1 - results["distances"][0][i]
-                            if results["distances"][0]
-                            else 0
-                        ),
+                        "url": meta.get("url", ""),
+                        "title": meta.get("title", ""),
+                        "domain": meta.get("domain", ""),
+                        "similarity_score": score,
                         "content_preview": (
-                            results["documents"][0][i][:300] + "..."
-                            if len(results["documents"][0][i]) > 300
-                            else results["documents"][0][i]
+                            document[:300] + "..." if len(document) > 300 else document
                         ),
-                        "fetch_time": results["metadatas"][0][i].get("fetch_time", 0),
+                        "fetch_time": meta.get("fetch_time", 0),
                     }
-                    search_results.append(result_item)
+                    for doc_id, meta, score, document in zip(
+                        ids, metadatas, scores, documents
+                    )
+                ]
 
             execution_time = (time.time() - start_time) * 1000
 
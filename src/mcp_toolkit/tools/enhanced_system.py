@@ -5,11 +5,14 @@
 扩展现有的系统工具，添加 ChromaDB 集成。
 """
 
-import json
+import asyncio
+import functools
+import heapq
 import platform
 import subprocess  # nosec B404
 import time
-from typing import Any, Dict, List, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 
 import psutil
 
@@ -26,6 +29,79 @@ from .base import (
     ValidationResult,
 )
 
+# 进程详情查询字段（process_iter/as_dict 一次性读取）
+_PROCESS_INFO_ATTRS = [
+    "pid",
+    "name",
+    "status",
+    "cpu_percent",
+    "memory_percent",
+    "create_time",
+    "num_threads",
+    "cmdline",
+]
+
+# as_dict 中无权限读取的字段以该哨兵值填充，含该值的进程整体跳过
+_ACCESS_DENIED = object()
+
+
+def _cpu_percent_key(info: Dict[str, Any]) -> float:
+    """进程排序键：无权限读取时 cpu_percent 为 None，按 0 处理"""
+    return info.get("cpu_percent") or 0.0
+
+
+@functools.cache
+def _static_platform_info() -> Dict[str, Any]:
+    """获取进程生命周期内不变的平台信息（仅查询一次）"""
+    return {
+        "system": platform.system(),
+        "release": platform.release(),
+        "version": platform.version(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "architecture": platform.architecture(),
+        "hostname": platform.node(),
+    }
+
+
+@functools.cache
+def _static_cpu_counts() -> Tuple[Optional[int], Optional[int]]:
+    """获取物理/逻辑 CPU 核心数（仅查询一次）"""
+    return psutil.cpu_count(), psutil.cpu_count(logical=True)
+
+
+# 工具定义与实例无关，模块加载时构建一次，get_definition() 直接复用
+_GET_SYSTEM_INFO_DEF = ToolDefinition(
+    name="get_system_info",
+    description="获取系统信息并可选择存储到 ChromaDB",
+    parameters={
+        "type": "object",
+        "properties": {
+            "include_processes": {
+                "type": "boolean",
+                "default": False,
+                "description": "是否包含进程信息",
+            },
+            "include_network": {
+                "type": "boolean",
+                "default": False,
+                "description": "是否包含网络信息",
+            },
+            "include_disk": {
+                "type": "boolean",
+                "default": True,
+                "description": "是否包含磁盘信息",
+            },
+            "store_to_chromadb": {
+                "type": "boolean",
+                "default": True,
+                "description": "是否将信息存储到 ChromaDB",
+            },
+        },
+        "required": [],
+    },
+)
+
 
 class SystemInfoTool(BaseTool):
     """系统信息获取工具 - 支持 ChromaDB 存储"""
@@ -38,38 +114,17 @@ class SystemInfoTool(BaseTool):
         super().__init__(config)
         self.data_manager = data_manager or UnifiedDataManager()
         self.auto_store = self.config.get("auto_store_to_chromadb", True)
+        self.disk_probe_timeout = self.config.get("disk_probe_timeout", 2.0)
+        # 磁盘探测使用独立的小线程池，挂起的 statvfs 不会占满默认执行器；
+        # 同一挂载点上一次探测未结束时跳过，挂起的挂载点最多占用一个线程
+        self.disk_probe_workers = self.config.get("disk_probe_workers", 4)
+        self._disk_probe_executor: Optional[ThreadPoolExecutor] = None
+        self._disk_probes: Dict[str, "Future[Any]"] = {}
+        # 预热 CPU 采样计数器：之后以 interval=None 非阻塞读取自上次调用以来的使用率
+        psutil.cpu_percent(interval=None)
 
     def get_definition(self) -> ToolDefinition:
-        return ToolDefinition(
-            name="get_system_info",
-            description="获取系统信息并可选择存储到 ChromaDB",
-            parameters={
-                "type": "object",
-                "properties": {
-                    "include_processes": {
-                        "type": "boolean",
-                        "default": False,
-                        "description": "是否包含进程信息",
-                    },
-                    "include_network": {
-                        "type": "boolean",
-                        "default": False,
-                        "description": "是否包含网络信息",
-                    },
-                    "include_disk": {
-                        "type": "boolean",
-                        "default": True,
-                        "description": "是否包含磁盘信息",
-                    },
-                    "store_to_chromadb": {
-                        "type": "boolean",
-                        "default": True,
-                        "description": "是否将信息存储到 ChromaDB",
-                    },
-                },
-                "required": [],
-            },
-        )
+        return _GET_SYSTEM_INFO_DEF
 
     async def execute(self, request: ToolExecutionRequest) -> ToolExecutionResult:
         """执行系统信息获取"""
@@ -82,54 +137,30 @@ class SystemInfoTool(BaseTool):
         try:
             start_time = time.time()
 
-            # 基础系统信息
+            # 基础系统信息：静态部分已缓存，仅动态指标每次采集
+            cpu_count, cpu_count_logical = _static_cpu_counts()
+            cpu_freq = psutil.cpu_freq()
+            vm = psutil.virtual_memory()
             system_info: Dict[str, Any] = {
-                "platform": {
-                    "system": platform.system(),
-                    "release": platform.release(),
-                    "version": platform.version(),
-                    "machine": platform.machine(),
-                    "processor": platform.processor(),
-                    "architecture": platform.architecture(),
-                    "hostname": platform.node(),
-                },
+                "platform": dict(_static_platform_info()),
                 "cpu": {
-                    "count": psutil.cpu_count(),
-                    "count_logical": psutil.cpu_count(logical=True),
-                    "usage_percent": psutil.cpu_percent(interval=1),
-                    "frequency": (
-                        psutil.cpu_freq()._asdict() if psutil.cpu_freq() else None
-                    ),
+                    "count": cpu_count,
+                    "count_logical": cpu_count_logical,
+                    "usage_percent": psutil.cpu_percent(interval=None),
+                    "frequency": cpu_freq._asdict() if cpu_freq else None,
                 },
                 "memory": {
-                    "total": psutil.virtual_memory().total,
-                    "available": psutil.virtual_memory().available,
-                    "used": psutil.virtual_memory().used,
-                    "percentage": psutil.virtual_memory().percent,
+                    "total": vm.total,
+                    "available": vm.available,
+                    "used": vm.used,
+                    "percentage": vm.percent,
                 },
                 "timestamp": time.time(),
             }
 
             # 磁盘信息
             if include_disk:
-                disk_info = []
-                for partition in psutil.disk_partitions():
-                    try:
-                        usage = psutil.disk_usage(partition.mountpoint)
-                        disk_info.append(
-                            {
-                                "device": partition.device,
-                                "mountpoint": partition.mountpoint,
-                                "fstype": partition.fstype,
-                                "total": usage.total,
-                                "used": usage.used,
-                                "free": usage.free,
-                                "percentage": (usage.used / usage.total) * 100,
-                            }
-                        )
-                    except PermissionError:
-                        continue
-                system_info["disk"] = disk_info
+                system_info["disk"] = await self._collect_disk_info()
 
             # 网络信息
             if include_network:
@@ -155,17 +186,16 @@ class SystemInfoTool(BaseTool):
 
             # 进程信息
             if include_processes:
-                processes = []
-                for proc in psutil.process_iter(
-                    ["pid", "name", "cpu_percent", "memory_percent"]
-                ):
-                    try:
-                        processes.append(proc.info)
-                    except (psutil.NoSuchProcess, psutil.AccessDenied):
-                        continue
-                system_info["processes"] = sorted(
-                    processes, key=lambda x: x.get("cpu_percent", 0), reverse=True
-                )[:20]
+                system_info["processes"] = heapq.nlargest(
+                    20,
+                    (
+                        proc.info
+                        for proc in psutil.process_iter(
+                            ["pid", "name", "cpu_percent", "memory_percent"]
+                        )
+                    ),
+                    key=_cpu_percent_key,
+                )
 
             # 存储到 ChromaDB
             if store_to_chromadb and self.auto_store:
@@ -227,9 +257,85 @@ class SystemInfoTool(BaseTool):
                 "SYSTEM_INFO_ERROR", f"获取系统信息失败: {str(e)}"
             )
 
+    async def _probe_disk_usage(self, mountpoint: str) -> Any:
+        """在线程中查询单个挂载点，超时则放弃（防止挂起的网络挂载拖住整个工具）"""
+        previous = self._disk_probes.get(mountpoint)
+        if previous is not None and not previous.done():
+            raise asyncio.TimeoutError()
+
+        if self._disk_probe_executor is None:
+            self._disk_probe_executor = ThreadPoolExecutor(
+                max_workers=self.disk_probe_workers,
+                thread_name_prefix="disk-probe",
+            )
+        future = self._disk_probe_executor.submit(psutil.disk_usage, mountpoint)
+        self._disk_probes[mountpoint] = future
+        return await asyncio.wait_for(
+            asyncio.wrap_future(future), timeout=self.disk_probe_timeout
+        )
+
+    async def _collect_disk_info(self) -> List[Dict[str, Any]]:
+        """并发探测所有分区的磁盘使用情况"""
+        partitions = psutil.disk_partitions()
+        usages = await asyncio.gather(
+            *(self._probe_disk_usage(p.mountpoint) for p in partitions),
+            return_exceptions=True,
+        )
+
+        disk_info = []
+        for partition, usage in zip(partitions, usages):
+            if isinstance(usage, (OSError, asyncio.TimeoutError)):
+                continue
+            if isinstance(usage, BaseException):
+                raise usage
+            disk_info.append(
+                {
+                    "device": partition.device,
+                    "mountpoint": partition.mountpoint,
+                    "fstype": partition.fstype,
+                    "total": usage.total,
+                    "used": usage.used,
+                    "free": usage.free,
+                    "percentage": (usage.used / usage.total) * 100,
+                }
+            )
+        return disk_info
+
     async def cleanup(self) -> None:
         """清理资源"""
-        pass
+        # 挂起的探测线程无法中断，不等待其结束
+        if self._disk_probe_executor is not None:
+            self._disk_probe_executor.shutdown(wait=False, cancel_futures=True)
+            self._disk_probe_executor = None
+        self._disk_probes.clear()
+
+
+_MANAGE_PROCESSES_DEF = ToolDefinition(
+    name="manage_processes",
+    description="管理系统进程（查看、搜索进程信息）",
+    parameters={
+        "type": "object",
+        "properties": {
+            "action": {
+                "type": "string",
+                "enum": ["list", "search", "info"],
+                "description": "操作类型：list(列出进程), search(搜索进程), info(进程详情)",
+            },
+            "process_name": {
+                "type": "string",
+                "description": "进程名称（用于搜索和获取详情）",
+            },
+            "limit": {
+                "type": "integer",
+                "default": 20,
+                "minimum": 1,
+                "maximum": 100,
+                "description": "返回结果数量限制",
+            },
+        },
+        "required": ["action"],
+    },
+)
 
 
 class ProcessManagerTool(BaseTool):
@@ -244,32 +350,7 @@ class ProcessManagerTool(BaseTool):
         self.data_manager = data_manager or UnifiedDataManager()
 
     def get_definition(self) -> ToolDefinition:
-        return ToolDefinition(
-            name="manage_processes",
-            description="管理系统进程（查看、搜索进程信息）",
-            parameters={
-                "type": "object",
-                "properties": {
-                    "action": {
-                        "type": "string",
-                        "enum": ["list", "search", "info"],
-                        "description": "操作类型：list(列出进程), search(搜索进程), info(进程详情)",
-                    },
-                    "process_name": {
-                        "type": "string",
-                        "description": "进程名称（用于搜索和获取详情）",
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "default": 20,
-                        "minimum": 1,
-                        "maximum": 100,
-                        "description": "返回结果数量限制",
-                    },
-                },
-                "required": ["action"],
-            },
-        )
+        return _MANAGE_PROCESSES_DEF
 
     async def execute(self, request: ToolExecutionRequest) -> ToolExecutionResult:
         """执行进程管理"""
@@ -283,19 +364,17 @@ class ProcessManagerTool(BaseTool):
 
             if action == "list":
                 # 列出所有进程
-                processes = []
-                for proc in psutil.process_iter(
-                    ["pid", "name", "cpu_percent", "memory_percent", "status"]
-                ):
-                    try:
-                        processes.append(proc.info)
-                    except (psutil.NoSuchProcess, psutil.AccessDenied):
-                        continue
-
-                # 按CPU使用率排序
-                processes = sorted(
-                    processes, key=lambda x: x.get("cpu_percent", 0), reverse=True
-                )[:limit]
+                # 按CPU使用率取前 limit 个
+                processes = heapq.nlargest(
+                    limit,
+                    (
+                        proc.info
+                        for proc in psutil.process_iter(
+                            ["pid", "name", "cpu_percent", "memory_percent", "status"]
+                        )
+                    ),
+                    key=_cpu_percent_key,
+                )
                 result_content = {
                     "action": "list",
                     "processes": processes,
@@ -309,15 +388,14 @@ class ProcessManagerTool(BaseTool):
                     )
 
                 # 搜索进程
-                matching_processes = []
-                for proc in psutil.process_iter(
-                    ["pid", "name", "cpu_percent", "memory_percent", "status"]
-                ):
-                    try:
-                        if process_name.lower() in proc.info["name"].lower():
-                            matching_processes.append(proc.info)
-                    except (psutil.NoSuchProcess, psutil.AccessDenied):
-                        continue
+                needle = process_name.lower()
+                matching_processes = [
+                    proc.info
+                    for proc in psutil.process_iter(
+                        ["pid", "name", "cpu_percent", "memory_percent", "status"]
+                    )
+                    if needle in (proc.info["name"] or "").lower()
+                ]
 
                 result_content = {
                     "action": "search",
@@ -332,24 +410,20 @@ class ProcessManagerTool(BaseTool):
                         "MISSING_PARAMETER", "获取进程详情需要提供 process_name 参数"
                     )
 
-                # 获取进程详细信息
+                # 获取进程详细信息：先按名称过滤，仅对匹配进程批量读取详情
+                needle = process_name.lower()
                 process_details = []
-                for proc in psutil.process_iter():
+                for proc in psutil.process_iter(["name"]):
+                    if needle not in (proc.info["name"] or "").lower():
+                        continue
                     try:
-                        if process_name.lower() in proc.name().lower():
-                            proc_info = {
-                                "pid": proc.pid,
-                                "name": proc.name(),
-                                "status": proc.status(),
-                                "cpu_percent": proc.cpu_percent(),
-                                "memory_percent": proc.memory_percent(),
-                                "create_time": proc.create_time(),
-                                "num_threads": proc.num_threads(),
-                                "cmdline": proc.cmdline(),
-                            }
-                            process_details.append(proc_info)
+                        proc_info = proc.as_dict(
+                            _PROCESS_INFO_ATTRS, ad_value=_ACCESS_DENIED
+                        )
                     except (psutil.NoSuchProcess, psutil.AccessDenied):
                         continue
+                    if _ACCESS_DENIED not in proc_info.values():
+                        process_details.append(proc_info)
 
                 result_content = {
                     "action": "info",
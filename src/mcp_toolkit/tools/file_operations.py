@@ -5,15 +5,32 @@
 所有操作都包含安全检查和权限控制。
 """
 
+import asyncio
+import base64
+import errno
 import fnmatch
 import glob
 import os
+import re
 import shutil
 import stat
+import threading
 import time
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from operator import attrgetter
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 from ..core.interfaces import ToolDefinition
 from ..core.types import ConfigDict
@@ -28,13 +45,419 @@ from .base import (
     ValidationResult,
 )
 
+# 是否为支持 Unix 权限位的平台（非 Windows），导入时确定一次
+_POSIX = os.name != "nt"
+
+# 文本读取缓冲区大小，减少大文件读取的系统调用次数
+_READ_BUFFER_SIZE = 1 << 20
+
+# 二进制读取的单次 readinto 上限
+_BINARY_READ_CHUNK = 4 << 20
+
+
+# O_NOATIME 仅 Linux 提供，且只允许文件所有者使用
+_O_NOATIME = getattr(os, "O_NOATIME", 0)
+
+
+def _sequential_opener(path: str, flags: int) -> int:
+    """open() 的 opener：尽量不更新 atime，并提示内核按顺序读取以加大预读"""
+    try:
+        fd = os.open(path, flags | _O_NOATIME)
+    except PermissionError:
+        if not _O_NOATIME:
+            raise
+        fd = os.open(path, flags)
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass
+    return fd
+
+
+def _read_binary(file_path: str, size: int) -> bytearray:
+    """按已知大小预分配缓冲区，无缓冲地分块读入文件内容（最多 size 字节）"""
+    data = bytearray(size)
+    view = memoryview(data)
+    filled = 0
+    with open(file_path, "rb", buffering=0, opener=_sequential_opener) as f:
+        while filled < size:
+            n = f.readinto(view[filled : filled + _BINARY_READ_CHUNK])
+            if not n:
+                break
+            filled += n
+    view.release()
+    del data[filled:]
+    return data
+
+
+# 各写入模式对应的 os.open 标志，以及单次 os.write 的上限
+_WRITE_FLAGS = {
+    "create": os.O_WRONLY | os.O_CREAT | os.O_TRUNC,
+    "overwrite": os.O_WRONLY | os.O_CREAT | os.O_TRUNC,
+    "append": os.O_WRONLY | os.O_CREAT | os.O_APPEND,
+}
+_WRITE_CHUNK = 4 << 20
+
+# copy_file_range 不可用（跨文件系统、内核或文件系统不支持）时回退的错误码
+_COPY_FALLBACK_ERRNOS = frozenset(
+    (errno.EXDEV, errno.ENOSYS, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EINVAL)
+)
+
+
+def _copy_file(src_path: str, dst_path: str) -> None:
+    """复制文件内容及元数据，优先在内核态通过 copy_file_range 完成"""
+    copy_file_range = getattr(os, "copy_file_range", None)
+    copied = 0
+    try:
+        if copy_file_range is None:
+            raise OSError(errno.ENOSYS, "copy_file_range unavailable")
+        with (
+            open(src_path, "rb", buffering=0) as src,
+            open(dst_path, "wb", buffering=0) as dst,
+        ):
+            count = max(os.fstat(src.fileno()).st_size, _BINARY_READ_CHUNK)
+            while written := copy_file_range(src.fileno(), dst.fileno(), count):
+                copied += written
+    except OSError as e:
+        if e.errno not in _COPY_FALLBACK_ERRNOS:
+            raise
+        # 中途失败时已写入的部分不可用，整体重新复制
+        copied = 0
+    # 部分文件系统（procfs/sysfs、部分 FUSE/overlay）首次调用即返回 0，
+    # 未复制任何字节时回退，避免留下空的备份文件
+    if copied == 0:
+        # shutil.copyfile 在 Linux 上使用 sendfile，其他平台为分块复制
+        shutil.copyfile(src_path, dst_path)
+    shutil.copystat(src_path, dst_path)
+
+
+_T = TypeVar("_T")
+
+# 列目录时并发扫描的目录数
+_SCAN_CONCURRENCY = 32
+
+# list_files 排序字段到排序键的映射
+_SORT_KEYS = {
+    "name": attrgetter("name"),
+    "size": attrgetter("size"),
+    "modified_time": attrgetter("modified_time"),
+}
+
+
+def _current_umask() -> int:
+    """读取进程 umask（os.umask 只能通过设置来读取，因此立即还原）"""
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+# 模块加载时读取一次 umask：mkdir(path, mode) 得到的权限为 mode & ~umask，
+# 只有目标权限中有位被 umask 屏蔽时才需要额外 chmod
+_UMASK = _current_umask()
+
+
+# 目录权限字符串格式，与工具定义中的 pattern 一致
+_PERMISSIONS_PATTERN = re.compile(r"[0-7]{3}")
+
+
+def _parse_permissions(permissions: Any) -> Optional[int]:
+    """解析三位八进制权限字符串，格式不合法时返回 None"""
+    if isinstance(permissions, str) and _PERMISSIONS_PATTERN.fullmatch(permissions):
+        return int(permissions, 8)
+    return None
+
+
+# 创建目录时可预期的 OSError，按 errno 映射为错误码（不记录堆栈）
+_MKDIR_ERRNO_CODES = {
+    errno.ENOENT: "PARENT_NOT_EXISTS",
+    errno.ENOTDIR: "NOT_A_DIRECTORY",
+    errno.ENOSPC: "NO_SPACE",
+    errno.EROFS: "READ_ONLY_FS",
+    errno.ENAMETOOLONG: "NAME_TOO_LONG",
+    errno.ELOOP: "SYMLINK_LOOP",
+}
+
+
+def _path_kind(path: str) -> str:
+    """单次 stat 判断路径状态：missing / dir / file / denied"""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return "missing"
+    except PermissionError:
+        return "denied"
+    return "dir" if stat.S_ISDIR(st.st_mode) else "file"
+
+
+def _collapse_prefixes(prefixes: List[str]) -> Tuple[str, ...]:
+    """排序去重并剔除被更短前缀覆盖的项，startswith 判断结果不变"""
+    collapsed: List[str] = []
+    for prefix in sorted(set(prefixes)):
+        if not collapsed or not prefix.startswith(collapsed[-1]):
+            collapsed.append(prefix)
+    return tuple(collapsed)
+
+
+class _FileInfo(NamedTuple):
+    """目录列表中的单个条目，返回结果前再转换为字典"""
+
+    name: str
+    path: str
+    relative_path: str
+    type: str
+    size: int
+    modified_time: float  # 原始时间戳，转换为字典时才格式化
+    permissions: str
+    is_hidden: bool
+
+    def to_dict(self) -> Dict[str, Any]:
+        info = self._asdict()
+        info["modified_time"] = datetime.fromtimestamp(self.modified_time).isoformat()
+        return info
+
+
+# 工具定义与实例无关，模块加载时构建一次，get_definition() 直接复用
+_READ_FILE_DEF = ToolDefinition(
+    name="read_file",
+    description="读取指定文件的内容，支持文本和二进制文件",
+    parameters={
+        "type": "object",
+        "properties": {
+            "path": {
+                "type": "string",
+                "description": "文件路径（绝对或相对路径）",
+            },
+            "encoding": {
+                "type": "string",
+                "enum": ["utf-8", "gbk", "ascii", "base64", "binary"],
+                "default": "utf-8",
+                "description": (
+                    "文件编码格式；二进制文件建议使用 base64，"
+                    "binary（十六进制）已弃用"
+                ),
+            },
+            "max_size": {
+                "type": "integer",
+                "minimum": 1,
+                "maximum": 104857600,
+                "default": 10485760,
+                "description": "最大读取字节数",
+            },
+            "start_line": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "起始行号（可选）",
+            },
+            "end_line": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "结束行号（可选）",
+            },
+            "count_lines": {
+                "type": "boolean",
+                "default": True,
+                "description": "是否统计文件总行数（关闭后 lines_count 为 null）",
+            },
+        },
+        "required": ["path"],
+    },
+)
+
+_READ_FILES_BATCH_DEF = ToolDefinition(
+    name="read_files_batch",
+    description="一次读取多个文件的内容，各文件在线程池中并发读取",
+    parameters={
+        "type": "object",
+        "properties": {
+            "paths": {
+                "type": "array",
+                "items": {"type": "string"},
+                "minItems": 1,
+                "description": "文件路径列表（绝对或相对路径）",
+            },
+            "encoding": {
+                "type": "string",
+                "enum": ["utf-8", "gbk", "ascii", "base64", "binary"],
+                "default": "utf-8",
+                "description": "文件编码格式，对所有文件生效",
+            },
+            "max_size": {
+                "type": "integer",
+                "minimum": 1,
+                "maximum": 104857600,
+                "default": 10485760,
+                "description": "单个文件最大读取字节数",
+            },
+            "count_lines": {
+                "type": "boolean",
+                "default": True,
+                "description": "是否统计各文件总行数",
+            },
+        },
+        "required": ["paths"],
+    },
+)
+
+_WRITE_FILE_DEF = ToolDefinition(
+    name="write_file",
+    description="写入内容到指定文件，支持创建新文件和覆盖现有文件",
+    parameters={
+        "type": "object",
+        "properties": {
+            "path": {"type": "string", "description": "文件路径"},
+            "content": {"type": "string", "description": "要写入的内容"},
+            "encoding": {
+                "type": "string",
+                "enum": ["utf-8", "gbk", "ascii"],
+                "default": "utf-8",
+                "description": "文件编码格式",
+            },
+            "mode": {
+                "type": "string",
+                "enum": ["create", "overwrite", "append"],
+                "default": "create",
+                "description": "写入模式",
+            },
+            "backup": {
+                "type": "boolean",
+                "default": False,
+                "description": "是否创建备份",
+            },
+            "permissions": {
+                "type": "string",
+                "pattern": "^[0-7]{3}$",
+                "default": "644",
+                "description": "文件权限（Unix格式）",
+            },
+        },
+        "required": ["path", "content"],
+    },
+)
+
+_LIST_FILES_DEF = ToolDefinition(
+    name="list_files",
+    description="列出目录中的文件和子目录",
+    parameters={
+        "type": "object",
+        "properties": {
+            "path": {
+                "type": "string",
+                "default": ".",
+                "description": "目录路径",
+            },
+            "recursive": {
+                "type": "boolean",
+                "default": False,
+                "description": "是否递归列出子目录",
+            },
+            "include_hidden": {
+                "type": "boolean",
+                "default": False,
+                "description": "是否包含隐藏文件",
+            },
+            "pattern": {
+                "type": "string",
+                "description": "文件名匹配模式（glob）",
+            },
+            "file_types": {
+                "type": "array",
+                "items": {
+                    "type": "string",
+                    "enum": ["file", "directory", "symlink"],
+                },
+                "default": ["file", "directory"],
+                "description": "文件类型过滤",
+            },
+            "max_depth": {
+                "type": "integer",
+                "minimum": 1,
+                "maximum": 10,
+                "default": 5,
+                "description": "最大递归深度",
+            },
+            "sort_by": {
+                "type": "string",
+                "enum": ["name", "size", "modified_time", "created_time"],
+                "default": "name",
+                "description": "排序字段",
+            },
+            "sort_order": {
+                "type": "string",
+                "enum": ["asc", "desc"],
+                "default": "asc",
+                "description": "排序顺序",
+            },
+        },
+        "required": [],
+    },
+)
+
+_CREATE_DIRECTORY_DEF = ToolDefinition(
+    name="create_directory",
+    description="创建目录，支持递归创建父目录",
+    parameters={
+        "type": "object",
+        "properties": {
+            "path": {"type": "string", "description": "目录路径"},
+            "recursive": {
+                "type": "boolean",
+                "default": True,
+                "description": "是否递归创建父目录",
+            },
+            "permissions": {
+                "type": "string",
+                "pattern": "^[0-7]{3}$",
+                "default": "755",
+                "description": "目录权限（Unix格式）",
+            },
+            "exist_ok": {
+                "type": "boolean",
+                "default": True,
+                "description": "目录已存在时是否报错",
+            },
+        },
+        "required": ["path"],
+    },
+)
+
+_CREATE_DIRECTORIES_DEF = ToolDefinition(
+    name="create_directories",
+    description="批量创建多个目录，共享的父目录只创建一次",
+    parameters={
+        "type": "object",
+        "properties": {
+            "paths": {
+                "type": "array",
+                "items": {"type": "string"},
+                "minItems": 1,
+                "description": "目录路径列表，缺失的父目录会一并创建",
+            },
+            "permissions": {
+                "type": "string",
+                "pattern": "^[0-7]{3}$",
+                "default": "755",
+                "description": "所列目录的权限（Unix格式）",
+            },
+        },
+        "required": ["paths"],
+    },
+)
+
 
 class BaseFileOperationTool(BaseTool):
     """文件操作工具基类"""
 
-    def __init__(self, config: Optional[ConfigDict] = None):
+    def __init__(
+        self,
+        config: Optional[ConfigDict] = None,
+        executor: Optional[ThreadPoolExecutor] = None,
+    ):
         super().__init__(config)
 
+        # 阻塞文件 I/O 使用的线程池，未注入时使用事件循环的默认线程池
+        self._executor = executor
+
         self.allowed_paths = self.config.get(
             "allowed_paths", ["/workspace", "/tmp/mcp-toolkit"]  # nosec B108
         )
@@ -47,12 +470,24 @@ class BaseFileOperationTool(BaseTool):
             "forbidden_extensions", [".exe", ".dll", ".so"]
         )
 
-    def _is_path_safe(self, normalized_path: str) -> bool:
+        # 安全/禁止路径前缀缓存，首次验证时计算
+        self._safe_prefixes: Optional[Tuple[str, ...]] = None
+        self._forbidden_prefixes: Optional[Tuple[str, ...]] = None
+        # 被拒绝路径的验证结果缓存: (path, cwd) -> ValidationResult
+        self._deny_cache: OrderedDict[Tuple[str, str], ValidationResult]
+        self._deny_cache = OrderedDict()
+        self._deny_cache_size = self.config.get("deny_cache_size", 4096)
+
+    def _get_safe_prefixes(self) -> Tuple[str, ...]:
         """
-        智能路径安全验证
+        计算固定的安全路径前缀（结果按实例缓存）
         使用安全策略而非硬编码白名单，更适合多用户环境
         """
+        if self._safe_prefixes is not None:
+            return self._safe_prefixes
+
         import pwd
+        import tempfile
 
         # 获取当前用户信息
         try:
@@ -61,38 +496,66 @@ class BaseFileOperationTool(BaseTool):
         except (KeyError, AttributeError):
             user_home = os.path.expanduser("~")
 
-        # 获取当前工作目录
-        current_dir = os.getcwd()
-
         # 安全路径策略：
         # 1. 允许用户家目录及其子目录
-        if normalized_path.startswith(user_home):
-            return True
+        # 2. 允许临时目录（使用系统临时目录）
+        prefixes = [user_home, tempfile.gettempdir()]
 
-        # 2. 允许当前工作目录及其子目录
-        if normalized_path.startswith(current_dir):
-            return True
+        # 3. 如果配置了allowed_paths，也检查这些路径（向后兼容）
+        for allowed_path in self.allowed_paths or []:
+            prefixes.append(os.path.abspath(os.path.expanduser(allowed_path)))
 
-        # 3. 允许临时目录
-        import tempfile
+        self._safe_prefixes = _collapse_prefixes(prefixes)
+        return self._safe_prefixes
 
-        temp_dirs = [tempfile.gettempdir()]  # 使用系统临时目录
-        for temp_dir in temp_dirs:
-            if normalized_path.startswith(temp_dir):
-                return True
+    def _get_forbidden_prefixes(self) -> Tuple[str, ...]:
+        """计算禁止访问的路径前缀（结果按实例缓存）"""
+        if self._forbidden_prefixes is None:
+            self._forbidden_prefixes = _collapse_prefixes(
+                [os.path.abspath(forbidden) for forbidden in self.forbidden_paths]
+            )
+        return self._forbidden_prefixes
 
-        # 4. 如果配置了allowed_paths，也检查这些路径（向后兼容）
-        if self.allowed_paths:
-            for allowed_path in self.allowed_paths:
-                expanded_allowed = os.path.abspath(os.path.expanduser(allowed_path))
-                if normalized_path.startswith(expanded_allowed):
-                    return True
+    async def _run_blocking(self, func: Callable[..., _T], *args: Any) -> _T:
+        """在文件 I/O 线程池中执行阻塞调用"""
+        if self._executor is None:
+            return await asyncio.to_thread(func, *args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
 
-        # 5. 其他路径默认不允许
-        return False
+    def invalidate_path_cache(self) -> None:
+        """清除缓存的路径前缀及拒绝结果（路径配置变化后调用）"""
+        self._safe_prefixes = None
+        self._forbidden_prefixes = None
+        self._deny_cache.clear()
+
+    def _is_path_safe(self, normalized_path: str) -> bool:
+        """
+        智能路径安全验证
+        当前工作目录可能被切换，因此每次实时获取；其他路径默认不允许
+        """
+        if normalized_path.startswith(self._get_safe_prefixes()):
+            return True
+        return normalized_path.startswith(os.getcwd())
 
     def _validate_path(self, path: str) -> ValidationResult:
-        """验证路径安全性"""
+        """验证路径安全性（被拒绝的路径结果会被缓存）"""
+        # 相对路径及工作目录策略都依赖当前工作目录，因此一并作为缓存键
+        cache_key = (path, os.getcwd())
+        denied = self._deny_cache.get(cache_key)
+        if denied is not None:
+            self._deny_cache.move_to_end(cache_key)
+            return denied
+
+        result = self._check_path(path)
+        if not result.is_valid and self._deny_cache_size > 0:
+            self._deny_cache[cache_key] = result
+            if len(self._deny_cache) > self._deny_cache_size:
+                self._deny_cache.popitem(last=False)
+        return result
+
+    def _check_path(self, path: str) -> ValidationResult:
+        """执行路径安全检查"""
         errors = []
 
         try:
@@ -100,15 +563,14 @@ class BaseFileOperationTool(BaseTool):
             normalized_path = os.path.abspath(os.path.expanduser(path))
 
             # 检查是否在禁止路径中
-            for forbidden in self.forbidden_paths:
-                if normalized_path.startswith(os.path.abspath(forbidden)):
-                    errors.append(
-                        ValidationError(
-                            field="path",
-                            message=f"路径 {path} 在禁止访问的目录中",
-                            code="FORBIDDEN_PATH",
-                        )
+            if normalized_path.startswith(self._get_forbidden_prefixes()):
+                errors.append(
+                    ValidationError(
+                        field="path",
+                        message=f"路径 {path} 在禁止访问的目录中",
+                        code="FORBIDDEN_PATH",
                     )
+                )
 
             # 智能路径验证：使用安全策略而非硬编码白名单
             if not self._is_path_safe(normalized_path):
@@ -163,43 +625,7 @@ class ReadFileTool(BaseFileOperationTool):
     """读取文件工具"""
 
     def get_definition(self) -> ToolDefinition:
-        return ToolDefinition(
-            name="read_file",
-            description="读取指定文件的内容，支持文本和二进制文件",
-            parameters={
-                "type": "object",
-                "properties": {
-                    "path": {
-                        "type": "string",
-                        "description": "文件路径（绝对或相对路径）",
-                    },
-                    "encoding": {
-                        "type": "string",
-                        "enum": ["utf-8", "gbk", "ascii", "binary"],
-                        "default": "utf-8",
-                        "description": "文件编码格式",
-                    },
-                    "max_size": {
-                        "type": "integer",
-                        "minimum": 1,
-                        "maximum": 104857600,
-                        "default": 10485760,
-                        "description": "最大读取字节数",
-                    },
-                    "start_line": {
-                        "type": "integer",
-                        "minimum": 1,
-                        "description": "起始行号（可选）",
-                    },
-                    "end_line": {
-                        "type": "integer",
-                        "minimum": 1,
-                        "description": "结束行号（可选）",
-                    },
-                },
-                "required": ["path"],
-            },
-        )
+        return _READ_FILE_DEF
 
     def validate_parameters(self, params: Dict[str, Any]) -> ValidationResult:
         """验证参数"""
@@ -217,7 +643,7 @@ class ReadFileTool(BaseFileOperationTool):
 
         # 验证编码
         encoding = params.get("encoding", "utf-8")
-        if encoding not in ["utf-8", "gbk", "ascii", "binary"]:
+        if encoding not in ["utf-8", "gbk", "ascii", "base64", "binary"]:
             errors.append(
                 ValidationError(
                     field="encoding",
@@ -280,6 +706,18 @@ class ReadFileTool(BaseFileOperationTool):
                 )
             )
 
+        # 验证行数统计开关
+        count_lines = params.get("count_lines", True)
+        if not isinstance(count_lines, bool):
+            errors.append(
+                ValidationError(
+                    field="count_lines",
+                    message="count_lines 必须是布尔值",
+                    code="INVALID_COUNT_LINES",
+                )
+            )
+        sanitized["count_lines"] = count_lines
+
         return ValidationResult(
             is_valid=len(errors) == 0,
             errors=errors,
@@ -294,7 +732,22 @@ class ReadFileTool(BaseFileOperationTool):
         max_size = params.get("max_size", 10485760)
         start_line = params.get("start_line")
         end_line = params.get("end_line")
+        count_lines = params.get("count_lines", True)
+
+        return self._read_file(
+            file_path, encoding, max_size, start_line, end_line, count_lines
+        )
 
+    def _read_file(
+        self,
+        file_path: str,
+        encoding: str,
+        max_size: int,
+        start_line: Optional[int] = None,
+        end_line: Optional[int] = None,
+        count_lines: bool = True,
+    ) -> ToolExecutionResult:
+        """读取单个文件并构建结果（同步执行，批量读取时在线程中调用）"""
         try:
             # 检查文件存在性
             if not os.path.exists(file_path):
@@ -311,7 +764,6 @@ class ReadFileTool(BaseFileOperationTool):
             # 获取文件信息
             stat_info = os.stat(file_path)
             file_size = stat_info.st_size
-            modified_time = datetime.fromtimestamp(stat_info.st_mtime)
 
             # 检查文件大小
             if file_size > max_size:
@@ -321,22 +773,43 @@ class ReadFileTool(BaseFileOperationTool):
                 )
 
             # 读取文件内容
-            if encoding == "binary":
-                with open(file_path, "rb") as f:
-                    content = f.read().hex()
+            if encoding in ("base64", "binary"):
+                data = _read_binary(file_path, file_size)
+                if encoding == "base64":
+                    content = base64.b64encode(data).decode("ascii")
+                else:
+                    content = data.hex()
                 is_binary = True
             else:
                 try:
-                    with open(file_path, "r", encoding=encoding) as f:
+                    with open(
+                        file_path,
+                        "r",
+                        encoding=encoding,
+                        buffering=_READ_BUFFER_SIZE,
+                        opener=_sequential_opener,
+                    ) as f:
                         if start_line is not None or end_line is not None:
-                            lines = f.readlines()
-                            start_idx = (start_line - 1) if start_line else 0
-                            end_idx = end_line if end_line else len(lines)
-                            content = "".join(lines[start_idx:end_idx])
-                            lines_count = len(lines)
+                            # 逐行读取，只保留请求范围内的行；其余行仅在需要时计数
+                            first = start_line or 1
+                            window = []
+                            line_no = 0
+                            for line_no, line in enumerate(f, 1):
+                                if line_no >= first:
+                                    window.append(line)
+                                    if line_no == end_line:
+                                        if count_lines:
+                                            line_no += sum(1 for _ in f)
+                                        break
+                            content = "".join(window)
+                            lines_count = line_no if count_lines else None
                         else:
                             content = f.read()
-                            lines_count = content.count("\n") + 1 if content else 0
+                            lines_count = (
+                                (content.count("\n") + 1 if content else 0)
+                                if count_lines
+                                else None
+                            )
                     is_binary = False
                 except UnicodeDecodeError:
                     return self._create_error_result(
@@ -348,7 +821,9 @@ class ReadFileTool(BaseFileOperationTool):
                 "content": content,
                 "metadata": {
                     "size": file_size,
-                    "modified_time": modified_time.isoformat(),
+                    "modified_time": datetime.fromtimestamp(
+                        stat_info.st_mtime
+                    ).isoformat(),
                     "encoding": encoding,
                     "lines_count": lines_count if not is_binary else None,
                     "is_binary": is_binary,
@@ -381,45 +856,133 @@ class ReadFileTool(BaseFileOperationTool):
         pass
 
 
+class BatchReadFileTool(ReadFileTool):
+    """批量读取文件工具"""
+
+    def __init__(
+        self,
+        config: Optional[ConfigDict] = None,
+        executor: Optional[ThreadPoolExecutor] = None,
+    ):
+        super().__init__(config, executor)
+        self.max_files_per_operation = self.config.get("max_files_per_operation", 1000)
+
+    def get_definition(self) -> ToolDefinition:
+        return _READ_FILES_BATCH_DEF
+
+    def validate_parameters(self, params: Dict[str, Any]) -> ValidationResult:
+        """验证参数"""
+        paths = params.get("paths")
+        if (
+            not isinstance(paths, list)
+            or not paths
+            or len(paths) > self.max_files_per_operation
+        ):
+            return ValidationResult(
+                is_valid=False,
+                errors=[
+                    ValidationError(
+                        field="paths",
+                        message=(
+                            f"paths 必须是包含 1 到 {self.max_files_per_operation} "
+                            "个路径的列表"
+                        ),
+                        code="INVALID_PATHS",
+                    )
+                ],
+            )
+
+        # 逐个路径复用单文件读取的验证规则，任一路径不合法则整体拒绝
+        sanitized: Dict[str, Any] = {}
+        sanitized_paths = []
+        for path in paths:
+            validation = super().validate_parameters({**params, "path": path})
+            if not validation.is_valid or validation.sanitized_params is None:
+                return validation
+            sanitized = validation.sanitized_params
+            sanitized_paths.append(sanitized.pop("path"))
+
+        sanitized["paths"] = sanitized_paths
+        return ValidationResult(is_valid=True, sanitized_params=sanitized)
+
+    async def execute(self, request: ToolExecutionRequest) -> ToolExecutionResult:
+        """执行批量文件读取"""
+        params = request.parameters
+        file_paths = [self._resolve_path(path, request) for path in params["paths"]]
+        encoding = params.get("encoding", "utf-8")
+        max_size = params.get("max_size", 10485760)
+        count_lines = params.get("count_lines", True)
+
+        try:
+            # 每个文件的读取都是阻塞 I/O，放入线程池并发执行
+            results = await asyncio.gather(
+                *(
+                    self._run_blocking(
+                        self._read_file,
+                        file_path,
+                        encoding,
+                        max_size,
+                        None,
+                        None,
+                        count_lines,
+                    )
+                    for file_path in file_paths
+                )
+            )
+
+            files = []
+            total_size = 0
+            for file_path, result in zip(file_paths, results):
+                if result.success:
+                    content: Any = result.content
+                    total_size += content["metadata"]["size"]
+                    files.append({"path": file_path, "success": True, **content})
+                else:
+                    error = result.error
+                    files.append(
+                        {
+                            "path": file_path,
+                            "success": False,
+                            "error": {
+                                "code": error.code if error else "READ_ERROR",
+                                "message": error.message if error else "",
+                            },
+                        }
+                    )
+
+            result_content = {
+                "files": files,
+                "total_count": len(files),
+                "success_count": sum(1 for result in results if result.success),
+            }
+
+            metadata = ExecutionMetadata(
+                execution_time=0,  # 会被注册中心填充
+                memory_used=total_size / 1024 / 1024,  # MB
+                cpu_time=0,
+                io_operations=len(file_paths),
+            )
+
+            resources = ResourceUsage(
+                memory_mb=total_size / 1024 / 1024,
+                cpu_time_ms=0,
+                io_operations=len(file_paths),
+            )
+
+            return self._create_success_result(result_content, metadata, resources)
+
+        except Exception as e:
+            self._logger.exception("批量读取文件时发生异常")
+            return self._create_error_result(
+                "READ_ERROR", f"批量读取文件失败: {str(e)}"
+            )
+
+
 class WriteFileTool(BaseFileOperationTool):
     """写入文件工具"""
 
     def get_definition(self) -> ToolDefinition:
-        return ToolDefinition(
-            name="write_file",
-            description="写入内容到指定文件，支持创建新文件和覆盖现有文件",
-            parameters={
-                "type": "object",
-                "properties": {
-                    "path": {"type": "string", "description": "文件路径"},
-                    "content": {"type": "string", "description": "要写入的内容"},
-                    "encoding": {
-                        "type": "string",
-                        "enum": ["utf-8", "gbk", "ascii"],
-                        "default": "utf-8",
-                        "description": "文件编码格式",
-                    },
-                    "mode": {
-                        "type": "string",
-                        "enum": ["create", "overwrite", "append"],
-                        "default": "create",
-                        "description": "写入模式",
-                    },
-                    "backup": {
-                        "type": "boolean",
-                        "default": False,
-                        "description": "是否创建备份",
-                    },
-                    "permissions": {
-                        "type": "string",
-                        "pattern": "^[0-7]{3}$",
-                        "default": "644",
-                        "description": "文件权限（Unix格式）",
-                    },
-                },
-                "required": ["path", "content"],
-            },
-        )
+        return _WRITE_FILE_DEF
 
     def validate_parameters(self, params: Dict[str, Any]) -> ValidationResult:
         """验证参数"""
@@ -544,20 +1107,25 @@ class WriteFileTool(BaseFileOperationTool):
             if backup and file_exists:
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 backup_path = f"{file_path}.backup_{timestamp}"
-                shutil.copy2(file_path, backup_path)
-
-            # 写入文件
-            write_mode = {"create": "w", "overwrite": "w", "append": "a"}[mode]
+                _copy_file(file_path, backup_path)
 
-            with open(file_path, write_mode, encoding=encoding) as f:
-                f.write(content)
+            # 写入文件：内容只编码一次，直接分块写入文件描述符
+            data = content.encode(encoding)
+            bytes_written = len(data)
+            flags = _WRITE_FLAGS[mode]
 
-            # 设置权限
-            if os.name != "nt":  # 非Windows系统
-                os.chmod(file_path, int(permissions, 8))
+            fd = os.open(file_path, flags, 0o644)
+            try:
+                view = memoryview(data)
+                offset = 0
+                while offset < bytes_written:
+                    offset += os.write(fd, view[offset : offset + _WRITE_CHUNK])
 
-            # 获取写入的字节数
-            bytes_written = len(content.encode(encoding))
+                # 设置权限
+                if _POSIX:
+                    os.fchmod(fd, int(permissions, 8))
+            finally:
+                os.close(fd)
 
             # 构建响应
             result_content = {
@@ -596,63 +1164,7 @@ class ListFilesTool(BaseFileOperationTool):
     """列出文件工具"""
 
     def get_definition(self) -> ToolDefinition:
-        return ToolDefinition(
-            name="list_files",
-            description="列出目录中的文件和子目录",
-            parameters={
-                "type": "object",
-                "properties": {
-                    "path": {
-                        "type": "string",
-                        "default": ".",
-                        "description": "目录路径",
-                    },
-                    "recursive": {
-                        "type": "boolean",
-                        "default": False,
-                        "description": "是否递归列出子目录",
-                    },
-                    "include_hidden": {
-                        "type": "boolean",
-                        "default": False,
-                        "description": "是否包含隐藏文件",
-                    },
-                    "pattern": {
-                        "type": "string",
-                        "description": "文件名匹配模式（glob）",
-                    },
-                    "file_types": {
-                        "type": "array",
-                        "items": {
-                            "type": "string",
-                            "enum": ["file", "directory", "symlink"],
-                        },
-                        "default": ["file", "directory"],
-                        "description": "文件类型过滤",
-                    },
-                    "max_depth": {
-                        "type": "integer",
-                        "minimum": 1,
-                        "maximum": 10,
-                        "default": 5,
-                        "description": "最大递归深度",
-                    },
-                    "sort_by": {
-                        "type": "string",
-                        "enum": ["name", "size", "modified_time", "created_time"],
-                        "default": "name",
-                        "description": "排序字段",
-                    },
-                    "sort_order": {
-                        "type": "string",
-                        "enum": ["asc", "desc"],
-                        "default": "asc",
-                        "description": "排序顺序",
-                    },
-                },
-                "required": [],
-            },
-        )
+        return _LIST_FILES_DEF
 
     async def execute(self, request: ToolExecutionRequest) -> ToolExecutionResult:
         """执行文件列表"""
@@ -678,101 +1190,126 @@ class ListFilesTool(BaseFileOperationTool):
                     "NOT_A_DIRECTORY", f"路径不是目录: {directory}"
                 )
 
-            files = []
-
-            def collect_files(current_dir: str, current_depth: int = 0) -> None:
-                """递归收集文件"""
-                if current_depth > max_depth:
-                    return
+            files: List[_FileInfo] = []
 
+            # 过滤条件只准备一次：glob 预编译为正则，类型集合用于 O(1) 判断
+            pattern_match = (
+                re.compile(fnmatch.translate(pattern)).match if pattern else None
+            )
+            wanted_types = frozenset(file_types)
+
+            def scan_directory(
+                current_dir: str, current_depth: int
+            ) -> Tuple[List[_FileInfo], List[str], Counter[str]]:
+                """扫描单个目录（在线程中执行）
+
+                返回收集到的条目、待遍历的子目录，以及收集到的各类型条目数。
+                """
+                found: List[_FileInfo] = []
+                subdirs: List[str] = []
+                type_counts: Counter[str] = Counter()
+                descend = recursive and current_depth < max_depth
                 try:
-                    for entry in os.listdir(current_dir):
-                        # 跳过隐藏文件（如果未启用）
-                        if not include_hidden and entry.startswith("."):
-                            continue
-
-                        entry_path = os.path.join(current_dir, entry)
-
-                        # 模式匹配
-                        if pattern and not fnmatch.fnmatch(entry, pattern):
-                            continue
-
-                        # 获取文件信息
-                        try:
-                            stat_info = os.lstat(entry_path)  # 使用lstat以支持符号链接
-
-                            # 确定文件类型
-                            if stat.S_ISDIR(stat_info.st_mode):
-                                file_type = "directory"
-                            elif stat.S_ISLNK(stat_info.st_mode):
-                                file_type = "symlink"
-                            else:
-                                file_type = "file"
-
-                            # 类型过滤
-                            if file_type not in file_types:
-                                # 如果是目录且开启递归，仍需要进入
-                                if file_type == "directory" and recursive:
-                                    collect_files(entry_path, current_depth + 1)
-                                continue
-
-                            # 构建文件信息
-                            file_info = {
-                                "name": entry,
-                                "path": entry_path,
-                                "relative_path": os.path.relpath(entry_path, directory),
-                                "type": file_type,
-                                "size": stat_info.st_size,
-                                "modified_time": datetime.fromtimestamp(
-                                    stat_info.st_mtime
-                                ).isoformat(),
-                                "permissions": oct(stat_info.st_mode)[-3:],
-                                "is_hidden": entry.startswith("."),
-                            }
-
-                            files.append(file_info)
-
-                            # 递归处理子目录
-                            if file_type == "directory" and recursive:
-                                collect_files(entry_path, current_depth + 1)
-
-                        except OSError:
-                            # 跳过无法访问的文件
-                            continue
-
+                    with os.scandir(current_dir) as entries:
+                        for dir_entry in entries:
+                            collected = len(found)
+                            file_type = collect_entry(dir_entry, found)
+                            # 仅统计通过过滤、实际收集到的条目
+                            if file_type is not None and len(found) > collected:
+                                type_counts[file_type] += 1
+                            if descend and file_type == "directory":
+                                subdirs.append(dir_entry.path)
                 except OSError:
                     # 跳过无法访问的目录
                     pass
+                return found, subdirs, type_counts
+
+            def collect_entry(
+                dir_entry: os.DirEntry[str], found: List[_FileInfo]
+            ) -> Optional[str]:
+                """记录单个目录项，返回其类型（被跳过时返回 None）"""
+                entry = dir_entry.name
+
+                # 跳过隐藏文件（如果未启用）
+                if not include_hidden and entry.startswith("."):
+                    return None
+
+                entry_path = dir_entry.path
 
-            # 收集文件
-            collect_files(directory)
-
-            # 排序
-            if sort_by == "name":
-                files.sort(key=lambda x: str(x["name"]), reverse=(sort_order == "desc"))
-            elif sort_by == "size":
-                files.sort(
-                    key=lambda x: (
-                        int(x["size"]) if isinstance(x["size"], (str, int)) else 0
-                    ),
-                    reverse=(sort_order == "desc"),
+                # 模式匹配
+                if pattern_match is not None and not pattern_match(entry):
+                    return None
+
+                # 确定文件类型（不跟随符号链接；类型通常来自目录项本身，无需 stat）
+                try:
+                    if dir_entry.is_dir(follow_symlinks=False):
+                        file_type = "directory"
+                    elif dir_entry.is_symlink():
+                        file_type = "symlink"
+                    else:
+                        file_type = "file"
+                except OSError:
+                    # 跳过无法访问的文件
+                    return None
+
+                # 类型过滤（被过滤的目录在递归时仍需要进入）
+                if file_type not in wanted_types:
+                    return file_type
+
+                # 仅对通过过滤的条目获取文件信息
+                try:
+                    stat_info = dir_entry.stat(follow_symlinks=False)
+                except OSError:
+                    # 跳过无法访问的文件
+                    return None
+
+                # 构建文件信息
+                found.append(
+                    _FileInfo(
+                        name=entry,
+                        path=entry_path,
+                        relative_path=os.path.relpath(entry_path, directory),
+                        type=file_type,
+                        size=stat_info.st_size,
+                        modified_time=stat_info.st_mtime,
+                        permissions=oct(stat_info.st_mode)[-3:],
+                        is_hidden=entry.startswith("."),
+                    )
                 )
-            elif sort_by == "modified_time":
-                files.sort(
-                    key=lambda x: str(x["modified_time"]),
-                    reverse=(sort_order == "desc"),
+                return file_type
+
+            # 按层遍历目录树：同一批目录在线程池中并发扫描，结果按入队顺序合并
+            type_counts: Counter[str] = Counter()
+            pending = deque([(directory, 0)])
+            while pending:
+                batch = [
+                    pending.popleft()
+                    for _ in range(min(len(pending), _SCAN_CONCURRENCY))
+                ]
+                scanned = await asyncio.gather(
+                    *(
+                        self._run_blocking(scan_directory, path, depth)
+                        for path, depth in batch
+                    )
                 )
+                for (_, depth), (found, subdirs, counts) in zip(batch, scanned):
+                    files.extend(found)
+                    type_counts.update(counts)
+                    pending.extend((subdir, depth + 1) for subdir in subdirs)
+
+            # 排序（未收录的字段保持遍历顺序）
+            sort_key = _SORT_KEYS.get(sort_by)
+            if sort_key is not None:
+                files.sort(key=sort_key, reverse=(sort_order == "desc"))
 
-            # 统计信息
+            # 统计信息（数量在扫描时已累计）
             total_count = len(files)
-            directory_count = sum(1 for f in files if f["type"] == "directory")
-            file_count = sum(1 for f in files if f["type"] == "file")
 
             result_content = {
-                "files": files,
+                "files": [file_info.to_dict() for file_info in files],
                 "total_count": total_count,
-                "directory_count": directory_count,
-                "file_count": file_count,
+                "directory_count": type_counts["directory"],
+                "file_count": type_counts["file"],
             }
 
             metadata = ExecutionMetadata(
@@ -804,111 +1341,335 @@ class ListFilesTool(BaseFileOperationTool):
 class CreateDirectoryTool(BaseFileOperationTool):
     """创建目录工具"""
 
+    def __init__(
+        self,
+        config: Optional[ConfigDict] = None,
+        executor: Optional[ThreadPoolExecutor] = None,
+    ):
+        super().__init__(config, executor)
+
+        # 已确认存在的目录缓存（键为规范化的绝对路径），命中后只需一次 stat 复核；
+        # 创建在线程池中执行，因此需要加锁
+        self._known_dirs: OrderedDict[str, None] = OrderedDict()
+        self._known_dirs_size = self.config.get("known_dir_cache_size", 4096)
+        self._known_dirs_lock = threading.Lock()
+
     def get_definition(self) -> ToolDefinition:
-        return ToolDefinition(
-            name="create_directory",
-            description="创建目录，支持递归创建父目录",
-            parameters={
-                "type": "object",
-                "properties": {
-                    "path": {"type": "string", "description": "目录路径"},
-                    "recursive": {
-                        "type": "boolean",
-                        "default": True,
-                        "description": "是否递归创建父目录",
-                    },
-                    "permissions": {
-                        "type": "string",
-                        "pattern": "^[0-7]{3}$",
-                        "default": "755",
-                        "description": "目录权限（Unix格式）",
-                    },
-                    "exist_ok": {
-                        "type": "boolean",
-                        "default": True,
-                        "description": "目录已存在时是否报错",
-                    },
-                },
-                "required": ["path"],
-            },
-        )
+        return _CREATE_DIRECTORY_DEF
+
+    def invalidate_path_cache(self) -> None:
+        """清除缓存的路径前缀、拒绝结果及已知目录"""
+        super().invalidate_path_cache()
+        with self._known_dirs_lock:
+            self._known_dirs.clear()
+
+    def _is_known_directory(self, directory: str) -> bool:
+        """目录是否在缓存中且仍然存在（外部删除后自动移出缓存）"""
+        with self._known_dirs_lock:
+            if directory not in self._known_dirs:
+                return False
+            self._known_dirs.move_to_end(directory)
+        if _path_kind(directory) == "dir":
+            return True
+        with self._known_dirs_lock:
+            self._known_dirs.pop(directory, None)
+        return False
+
+    def _remember_directories(self, directories: List[str]) -> None:
+        """记录已确认存在的目录（路径需已规范化）"""
+        if self._known_dirs_size <= 0:
+            return
+        with self._known_dirs_lock:
+            for directory in directories:
+                self._known_dirs[directory] = None
+                self._known_dirs.move_to_end(directory)
+            while len(self._known_dirs) > self._known_dirs_size:
+                self._known_dirs.popitem(last=False)
 
     async def execute(self, request: ToolExecutionRequest) -> ToolExecutionResult:
         """执行创建目录"""
         params = request.parameters
-        directory = self._resolve_path(params["path"], request)
+        # 规范化为绝对路径（折叠 ..、. 与重复分隔符），返回的 path 也是该形式
+        directory = os.path.abspath(self._resolve_path(params["path"], request))
         recursive = params.get("recursive", True)
         permissions = params.get("permissions", "755")
         exist_ok = params.get("exist_ok", True)
 
+        # 权限在创建前解析一次，格式错误时不做任何文件系统操作
+        mode = _parse_permissions(permissions)
+        if mode is None:
+            return self._invalid_permissions_result(permissions)
+
+        # path 为空或 "." 时目标即工作目录本身，存在时无需进入创建流程
+        if exist_ok and params["path"] in ("", ".") and os.path.isdir(directory):
+            return self._directory_result(directory, [])
+
+        # mkdir/chmod 都是阻塞系统调用，放入线程池执行以免阻塞事件循环
+        return await self._run_blocking(
+            self._create_directory, directory, recursive, mode, exist_ok
+        )
+
+    def _invalid_permissions_result(self, permissions: Any) -> ToolExecutionResult:
+        """权限格式错误的结果"""
+        return self._create_error_result(
+            "INVALID_PERMISSIONS_VALUE",
+            f"permissions 必须是3位八进制数字字符串: {permissions}",
+        )
+
+    def _create_directory(
+        self, directory: str, recursive: bool, mode: int, exist_ok: bool
+    ) -> ToolExecutionResult:
+        """创建目录并构建结果（同步执行）"""
         try:
-            created_directories = []
+            created_directories: List[str] = []
 
-            # 检查目录是否已存在
-            if os.path.exists(directory):
+            # 已知目录仍存在时跳过 mkdir，结果与“目录已存在”一致
+            if self._is_known_directory(directory):
                 if not exist_ok:
                     return self._create_error_result(
                         "DIRECTORY_EXISTS", f"目录已存在: {directory}"
                     )
-                if not os.path.isdir(directory):
-                    return self._create_error_result(
-                        "PATH_IS_FILE", f"路径已存在但不是目录: {directory}"
-                    )
-            else:
-                # 创建目录
+                return self._directory_result(directory, created_directories)
+
+            # 直接尝试创建，根据异常区分“已存在”与“父目录缺失”，不预先 stat
+            try:
                 if recursive:
-                    # 找出需要创建的所有父目录
-                    path_parts = Path(directory).parts
-                    for i in range(1, len(path_parts) + 1):
-                        partial_path = os.path.join(*path_parts[:i])
-                        if not os.path.exists(partial_path):
-                            created_directories.append(partial_path)
-
-                    os.makedirs(directory, exist_ok=exist_ok)
+                    # 自底向上找出缺失的祖先目录（lexists 不跟随悬空链接），
+                    # 再按自顶向下的顺序记录
+                    missing = directory
+                    while missing and not os.path.lexists(missing):
+                        created_directories.append(missing)
+                        parent = os.path.dirname(missing)
+                        if parent == missing:
+                            break
+                        missing = parent
+                    created_directories.reverse()
+
+                    os.makedirs(directory, mode)
                 else:
-                    parent_dir = os.path.dirname(directory)
-                    if parent_dir and not os.path.exists(parent_dir):
+                    try:
+                        os.mkdir(directory, mode)
+                    except FileNotFoundError:
+                        parent_dir = os.path.dirname(directory)
                         return self._create_error_result(
                             "PARENT_NOT_EXISTS", f"父目录不存在: {parent_dir}"
                         )
-                    os.mkdir(directory)
                     created_directories.append(directory)
+            except FileExistsError:
+                if not exist_ok:
+                    return self._create_error_result(
+                        "DIRECTORY_EXISTS", f"目录已存在: {directory}"
+                    )
+                path_kind = _path_kind(directory)
+                if path_kind == "denied":
+                    return self._create_error_result(
+                        "PERMISSION_DENIED", f"没有权限访问目录: {directory}"
+                    )
+                if path_kind != "dir":
+                    return self._create_error_result(
+                        "PATH_IS_FILE", f"路径已存在但不是目录: {directory}"
+                    )
+                created_directories = []
+            else:
+                # 权限已随 mkdir 设置，仅在被 umask 屏蔽时补 chmod
+                if _POSIX and mode & _UMASK:
+                    os.chmod(directory, mode)
 
-                # 设置权限
-                if os.name != "nt":  # 非Windows系统
-                    os.chmod(directory, int(permissions, 8))
+            self._remember_directories(created_directories or [directory])
+            return self._directory_result(directory, created_directories)
+
+        except PermissionError:
+            return self._create_error_result(
+                "PERMISSION_DENIED", f"没有权限创建目录: {directory}"
+            )
+        except OSError as e:
+            return self._mkdir_error_result(e, "创建目录失败")
+        except Exception as e:
+            self._logger.exception("创建目录时发生异常")
+            return self._create_error_result("CREATE_ERROR", f"创建目录失败: {str(e)}")
+
+    def _mkdir_error_result(
+        self,
+        error: OSError,
+        message: str,
+        created_directories: Optional[List[str]] = None,
+    ) -> ToolExecutionResult:
+        """按 errno 转换创建目录的错误，未知错误才记录堆栈"""
+        details = (
+            {"created_directories": created_directories}
+            if created_directories is not None
+            else None
+        )
+        code = _MKDIR_ERRNO_CODES.get(error.errno or 0)
+        if code is None:
+            self._logger.exception("{}时发生异常", message)
+            return self._create_error_result(
+                "CREATE_ERROR", f"{message}: {error}", details
+            )
+        self._logger.warning("{}: {}", message, error)
+        return self._create_error_result(code, f"{message}: {error}", details)
+
+    def _directory_result(
+        self, directory: str, created_directories: List[str]
+    ) -> ToolExecutionResult:
+        """构建创建目录的成功结果"""
+        result_content = {
+            "created": len(created_directories) > 0,
+            "path": directory,
+            "created_directories": created_directories,
+        }
+
+        metadata = ExecutionMetadata(
+            execution_time=0,
+            memory_used=0.1,
+            cpu_time=0,
+            io_operations=len(created_directories),
+        )
+
+        resources = ResourceUsage(
+            memory_mb=0.1, cpu_time_ms=0, io_operations=len(created_directories)
+        )
+
+        return self._create_success_result(result_content, metadata, resources)
+
+    async def cleanup(self) -> None:
+        """清理资源"""
+        pass
+
+
+class BulkCreateDirectoryTool(CreateDirectoryTool):
+    """批量创建目录工具"""
+
+    def __init__(
+        self,
+        config: Optional[ConfigDict] = None,
+        executor: Optional[ThreadPoolExecutor] = None,
+    ):
+        super().__init__(config, executor)
+        self.max_files_per_operation = self.config.get("max_files_per_operation", 1000)
+
+    def get_definition(self) -> ToolDefinition:
+        return _CREATE_DIRECTORIES_DEF
+
+    def validate_parameters(self, params: Dict[str, Any]) -> ValidationResult:
+        """验证参数"""
+        paths = params.get("paths")
+        if (
+            not isinstance(paths, list)
+            or not paths
+            or len(paths) > self.max_files_per_operation
+            or not all(isinstance(path, str) and path for path in paths)
+        ):
+            return ValidationResult(
+                is_valid=False,
+                errors=[
+                    ValidationError(
+                        field="paths",
+                        message=(
+                            f"paths 必须是包含 1 到 {self.max_files_per_operation} "
+                            "个非空路径的列表"
+                        ),
+                        code="INVALID_PATHS",
+                    )
+                ],
+            )
+        return ValidationResult(is_valid=True, sanitized_params=params)
+
+    async def execute(self, request: ToolExecutionRequest) -> ToolExecutionResult:
+        """执行批量创建目录"""
+        params = request.parameters
+        directories = [
+            os.path.abspath(self._resolve_path(path, request))
+            for path in params["paths"]
+        ]
+        permissions = params.get("permissions", "755")
+
+        mode = _parse_permissions(permissions)
+        if mode is None:
+            return self._invalid_permissions_result(permissions)
+
+        # 整批目录在一次线程池任务中完成
+        return await self._run_blocking(self._create_directories, directories, mode)
+
+    def _create_directories(
+        self, directories: List[str], mode: int
+    ) -> ToolExecutionResult:
+        """批量创建目录并构建结果（同步执行）"""
+        created_directories: List[str] = []
+        try:
+            # 自底向上收集缺失的目录，遇到已存在或已收集的祖先即停止，
+            # 共享的父目录因此只检查一次
+            missing = set()
+            for directory in directories:
+                path_kind = _path_kind(directory)
+                if path_kind == "dir":
+                    continue
+                if path_kind == "denied":
+                    return self._create_error_result(
+                        "PERMISSION_DENIED", f"没有权限访问目录: {directory}"
+                    )
+                if path_kind == "file":
+                    return self._create_error_result(
+                        "PATH_IS_FILE", f"路径已存在但不是目录: {directory}"
+                    )
+                current = directory
+                while current not in missing and not os.path.lexists(current):
+                    missing.add(current)
+                    parent = os.path.dirname(current)
+                    if parent == current:
+                        break
+                    current = parent
+
+            # 父目录是子目录的字符串前缀，字典序即可保证先父后子
+            # 仅对所列目录设置权限，中间目录与 makedirs 一致使用默认权限
+            requested = set(directories)
+            for directory in sorted(missing):
+                is_requested = directory in requested
+                try:
+                    os.mkdir(directory, mode if is_requested else 0o777)
+                except FileExistsError:
+                    # 并发创建的目录视为已存在
+                    continue
+                created_directories.append(directory)
+                if _POSIX and is_requested and mode & _UMASK:
+                    os.chmod(directory, mode)
 
             result_content = {
-                "created": not os.path.exists(directory)
-                or len(created_directories) > 0,
-                "path": directory,
+                "paths": directories,
                 "created_directories": created_directories,
+                "created_count": len(created_directories),
             }
 
             metadata = ExecutionMetadata(
                 execution_time=0,
                 memory_used=0.1,
                 cpu_time=0,
-                io_operations=len(created_directories),
+                io_operations=len(directories) + len(created_directories),
             )
 
             resources = ResourceUsage(
-                memory_mb=0.1, cpu_time_ms=0, io_operations=len(created_directories)
+                memory_mb=0.1,
+                cpu_time_ms=0,
+                io_operations=len(directories) + len(created_directories),
             )
 
             return self._create_success_result(result_content, metadata, resources)
 
-        except PermissionError:
+        except PermissionError as e:
             return self._create_error_result(
-                "PERMISSION_DENIED", f"没有权限创建目录: {directory}"
+                "PERMISSION_DENIED",
+                f"没有权限创建目录: {e.filename}",
+                {"created_directories": created_directories},
             )
+        except OSError as e:
+            return self._mkdir_error_result(e, "批量创建目录失败", created_directories)
         except Exception as e:
-            self._logger.exception("创建目录时发生异常")
-            return self._create_error_result("CREATE_ERROR", f"创建目录失败: {str(e)}")
-
-    async def cleanup(self) -> None:
-        """清理资源"""
-        pass
+            self._logger.exception("批量创建目录时发生异常")
+            return self._create_error_result(
+                "CREATE_ERROR",
+                f"批量创建目录失败: {str(e)}",
+                {"created_directories": created_directories},
+            )
 
 
 class FileOperationsTools:
@@ -917,14 +1678,24 @@ class FileOperationsTools:
     def __init__(self, config: Optional[ConfigDict] = None):
         self.config = config or {}
 
+        # 所有文件操作工具共享的 I/O 线程池：文件 I/O 多为阻塞等待，线程数按
+        # I/O 并发而非 CPU 核数设置；线程按需创建，解释器退出时回收
+        self._io_executor = ThreadPoolExecutor(
+            max_workers=self.config.get("io_threads", 64),
+            thread_name_prefix="fileops-io",
+        )
+
     def create_tools(self) -> List[BaseTool]:
         """创建所有文件操作工具"""
         # 直接使用传递的配置，如果没有则使用默认配置
         tools_config = self.config
+        executor = self._io_executor
 
         return [
-            ReadFileTool(tools_config),
-            WriteFileTool(tools_config),
-            ListFilesTool(tools_config),
-            CreateDirectoryTool(tools_config),
+            ReadFileTool(tools_config, executor),
+            BatchReadFileTool(tools_config, executor),
+            WriteFileTool(tools_config, executor),
+            ListFilesTool(tools_config, executor),
+            CreateDirectoryTool(tools_config, executor),
+            BulkCreateDirectoryTool(tools_config, executor),
         ]
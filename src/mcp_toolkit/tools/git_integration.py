@@ -5,30 +5,166 @@ Git 集成工具集
 解决当前只能整文件替换的核心问题，实现行级精确编辑。
 """
 
+import asyncio
 import hashlib
 import json
 import os
 import re
+import select
+import shutil
 import subprocess  # nosec B404
 import tempfile
+import threading
 import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 from ..core.interfaces import ToolDefinition
 from ..core.types import ConfigDict
 from ..storage.unified_manager import UnifiedDataManager
 from .base import (
     BaseTool,
-    ExecutionMetadata,
     ResourceEstimate,
-    ResourceUsage,
     ToolExecutionRequest,
     ToolExecutionResult,
     ValidationError,
     ValidationResult,
 )
 
+# cat-file --batch-check 成功解析时输出的对象类型
+_GIT_OBJECT_TYPES = frozenset({"commit", "tree", "blob", "tag"})
+_BATCH_CHECK_FORMAT = "--batch-check=%(objectname) %(objecttype)"
+
+# 各分析级别使用的 git diff 算法，未列出的级别使用默认的 myers
+_DIFF_ALGORITHMS = {"semantic": "histogram", "structural": "patience"}
+
+# git log -p 输出中各提交记录之前的分隔符（ASCII 记录分隔符）
+_COMMIT_SEPARATOR = "\x1e"
+
+# 会把解析结果原样返回（含 raw_diff）的输出格式
+_RAW_DIFF_FORMATS = frozenset({"json", "side-by-side"})
+
+# diff 代码块头部：@@ -旧起始,旧行数 +新起始,新行数 @@
+_HUNK_RE = re.compile(r"@@ -(\d+),?(\d*) \+(\d+),?(\d*) @@")
+
+# 语义影响判断用的关键字，按子串匹配，一次扫描完成
+_SIGNATURE_RE = re.compile(r"def |function |class |interface ")
+_IMPORT_RE = re.compile(r"import |from ")
+
+# git status --porcelain 中未解决冲突的条目（双方修改/双方添加/双方删除）
+_CONFLICT_STATUS_RE = re.compile(r"^(UU|AA|DD) (.*)$", re.MULTILINE)
+
+# 潜在冲突分析只关心 diff 输出中的文件头与代码块头两类行
+_DIFF_ANCHOR_RE = re.compile(r"^(?:(diff --git.*)|(@@.*))$", re.MULTILINE)
+
+# 扩展名（不含点）到语义类别的映射；code 需要进一步检查变更内容
+_EXT_CATEGORIES = {
+    **dict.fromkeys(("py", "js", "ts", "java"), "code"),
+    **dict.fromkeys(("json", "yaml", "yml", "toml"), "configuration_change"),
+    **dict.fromkeys(("md", "txt", "rst"), "documentation_change"),
+}
+
+# cleanup 时等待后台 ChromaDB 写入完成的最长秒数
+_STORE_DRAIN_TIMEOUT = 5.0
+
+_T = TypeVar("_T")
+
+
+class _OutputTooLarge(Exception):
+    """流式读取的 Git 输出超过大小限制"""
+
+
+def _limited_lines(stream: IO[str], max_size: int) -> Iterator[str]:
+    """逐行读取输出，累计字符数超过 max_size 时中止"""
+    size = 0
+    for line in stream:
+        size += len(line)
+        if size > max_size:
+            raise _OutputTooLarge()
+        yield line
+
+
+class _GitBatchWorker:
+    """常驻的 git cat-file --batch-check 进程，多次引用解析复用同一子进程"""
+
+    def __init__(self, cwd: str, timeout: float):
+        self._cwd = cwd
+        self._timeout = timeout
+        self._proc: Optional["subprocess.Popen[bytes]"] = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def resolve(self, names: List[str]) -> List[str]:
+        """按顺序写入引用名并读取对应的输出行，子进程异常或超时时抛出 OSError"""
+        with self._lock:
+            if self._closed:
+                raise OSError("git cat-file worker closed")
+            try:
+                if self._proc is None or self._proc.poll() is not None:
+                    self._proc = subprocess.Popen(  # nosec B603
+                        ["git", "cat-file", _BATCH_CHECK_FORMAT],
+                        cwd=self._cwd,
+                        stdin=subprocess.PIPE,
+                        stdout=subprocess.PIPE,
+                        stderr=subprocess.DEVNULL,
+                    )
+                stdin, stdout = self._proc.stdin, self._proc.stdout
+                if stdin is None or stdout is None:
+                    raise OSError("git cat-file pipes unavailable")
+                stdin.write(("\n".join(names) + "\n").encode())
+                stdin.flush()
+                data = self._read_lines(stdout.fileno(), len(names))
+                return [line.decode(errors="replace") for line in data]
+            except (OSError, ValueError):
+                self._terminate()
+                raise OSError("git cat-file worker failed")
+
+    def _read_lines(self, fd: int, count: int) -> List[bytes]:
+        """从管道读取 count 行输出，总等待时间不超过超时时间"""
+        deadline = time.monotonic() + self._timeout
+        buffer = b""
+        while buffer.count(b"\n") < count:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+                raise OSError("git cat-file timeout")
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                raise OSError("git cat-file exited unexpectedly")
+            buffer += chunk
+        return buffer.split(b"\n")[:count]
+
+    def close(self) -> None:
+        """结束子进程，关闭后不再重新启动"""
+        with self._lock:
+            self._closed = True
+            self._terminate()
+
+    def _terminate(self) -> None:
+        if self._proc is None:
+            return
+        proc, self._proc = self._proc, None
+        try:
+            if proc.stdin:
+                proc.stdin.close()
+            proc.wait(timeout=1)
+        except Exception:
+            proc.kill()
+            proc.wait()
+
 
 class BaseGitTool(BaseTool):
     """Git 工具基类"""
@@ -40,15 +176,46 @@ class BaseGitTool(BaseTool):
         )
         self.git_timeout = self.config.get("git_timeout", 30)
         self.max_diff_size = self.config.get("max_diff_size", 1024 * 1024)  # 1MB
+        # 按工作目录复用的常驻 cat-file 进程（LRU，超出上限时关闭最久未用的进程）
+        self.max_git_workers = self.config.get("max_git_workers", 4)
+        self._git_workers: OrderedDict[str, _GitBatchWorker] = OrderedDict()
+        self._git_workers_lock = threading.Lock()
+        # 已确认为 Git 仓库的工作目录（realpath），只缓存肯定结果
+        self._git_repo_dirs: Set[str] = set()
+
+    def _get_git_worker(self, cwd: Optional[str] = None) -> _GitBatchWorker:
+        """获取（必要时创建）指定工作目录的常驻 cat-file 进程"""
+        key = cwd or os.getcwd()
+        evicted: List[_GitBatchWorker] = []
+        with self._git_workers_lock:
+            worker = self._git_workers.get(key)
+            if worker is None:
+                worker = self._git_workers[key] = _GitBatchWorker(key, self.git_timeout)
+                while len(self._git_workers) > max(self.max_git_workers, 1):
+                    evicted.append(self._git_workers.popitem(last=False)[1])
+            else:
+                self._git_workers.move_to_end(key)
+        for old_worker in evicted:
+            old_worker.close()
+        return worker
+
+    def _close_git_workers(self) -> None:
+        """结束所有常驻 Git 进程"""
+        with self._git_workers_lock:
+            workers = list(self._git_workers.values())
+            self._git_workers.clear()
+        for worker in workers:
+            worker.close()
 
     def _run_git_command(
-        self, cmd: List[str], cwd: Optional[str] = None
+        self, cmd: List[str], cwd: Optional[str] = None, input: Optional[str] = None
     ) -> Tuple[bool, str, str]:
         """执行 Git 命令"""
         try:
             result = subprocess.run(  # nosec B603
                 ["git"] + cmd,
                 cwd=cwd or os.getcwd(),
+                input=input,
                 capture_output=True,
                 text=True,
                 timeout=self.git_timeout,
@@ -59,9 +226,64 @@ class BaseGitTool(BaseTool):
         except Exception as e:
             return False, "", str(e)
 
+    def _run_git_command_streaming(
+        self,
+        cmd: List[str],
+        consume: Callable[[Iterable[str]], _T],
+        cwd: Optional[str] = None,
+        max_size: Optional[int] = None,
+    ) -> Tuple[bool, Optional[_T], str]:
+        """执行 Git 命令并将标准输出逐行交给 consume 处理，不整体缓存输出"""
+        try:
+            # stderr 写入临时文件，避免读取 stdout 期间 stderr 管道写满阻塞
+            with tempfile.TemporaryFile(mode="w+") as stderr_file:
+                proc = subprocess.Popen(  # nosec B603
+                    ["git"] + cmd,
+                    cwd=cwd or os.getcwd(),
+                    stdout=subprocess.PIPE,
+                    stderr=stderr_file,
+                    text=True,
+                )
+                timed_out = threading.Event()
+
+                def _on_timeout() -> None:
+                    timed_out.set()
+                    proc.kill()
+
+                timer = threading.Timer(self.git_timeout, _on_timeout)
+                timer.start()
+                try:
+                    with proc:
+                        stream: IO[str] = proc.stdout  # type: ignore[assignment]
+                        try:
+                            value = consume(
+                                stream
+                                if max_size is None
+                                else _limited_lines(stream, max_size)
+                            )
+                        except BaseException:
+                            proc.kill()
+                            raise
+                finally:
+                    timer.cancel()
+
+                if timed_out.is_set():
+                    return False, None, "Git command timeout"
+                stderr_file.seek(0)
+                return proc.returncode == 0, value, stderr_file.read()
+        except _OutputTooLarge:
+            return False, None, f"Git output exceeds size limit ({max_size})"
+        except Exception as e:
+            return False, None, str(e)
+
     def _is_git_repository(self, path: Optional[str] = None) -> bool:
-        """检查是否为 Git 仓库"""
+        """检查是否为 Git 仓库，已确认的目录不再重复执行 git 命令"""
+        key = os.path.realpath(path or os.getcwd())
+        if key in self._git_repo_dirs:
+            return True
         success, _, _ = self._run_git_command(["rev-parse", "--git-dir"], cwd=path)
+        if success:
+            self._git_repo_dirs.add(key)
         return success
 
     def _get_file_content(self, file_path: str) -> Optional[str]:
@@ -73,23 +295,38 @@ class BaseGitTool(BaseTool):
             return None
 
     def _write_file_content(self, file_path: str, content: str) -> bool:
-        """写入文件内容"""
+        """写入文件内容，已存在的文件通过临时文件 + os.replace 原子替换"""
         try:
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(content)
+            # 符号链接写入其指向的文件，而不是替换链接本身
+            target = os.path.realpath(file_path)
+            directory = os.path.dirname(target)
+            os.makedirs(directory, exist_ok=True)
+            if not os.path.exists(target):
+                with open(target, "w", encoding="utf-8") as f:
+                    f.write(content)
+                return True
+
+            fd, tmp_path = tempfile.mkstemp(
+                dir=directory, prefix=f".{os.path.basename(target)}.", suffix=".tmp"
+            )
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(content)
+                shutil.copymode(target, tmp_path)
+                os.replace(tmp_path, target)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
             return True
         except Exception:
             return False
 
     def _create_backup(self, file_path: str) -> Optional[str]:
-        """创建文件备份"""
+        """创建文件备份，直接复制文件字节并保留时间戳"""
         try:
             backup_path = f"{file_path}.backup.{int(time.time())}"
-            content = self._get_file_content(file_path)
-            if content is not None:
-                self._write_file_content(backup_path, content)
-                return backup_path
+            shutil.copy2(file_path, backup_path)
+            return backup_path
         except Exception:  # nosec B110
             pass
         return None
@@ -98,6 +335,11 @@ class BaseGitTool(BaseTool):
 class GitDiffTool(BaseGitTool):
     """Git 差异分析工具"""
 
+    def __init__(self, config: Optional[ConfigDict] = None):
+        super().__init__(config)
+        # 尚未完成的 ChromaDB 后台写入任务，cleanup 时等待
+        self._pending_stores: Set["asyncio.Task[None]"] = set()
+
     def get_definition(self) -> ToolDefinition:
         return ToolDefinition(
             name="git_diff_analysis",
@@ -138,7 +380,7 @@ class GitDiffTool(BaseGitTool):
 
     async def execute(self, request: ToolExecutionRequest) -> ToolExecutionResult:
         """执行差异分析"""
-        start_time = time.time()
+        start_time = time.monotonic()
         params = request.parameters
 
         try:
@@ -162,9 +404,12 @@ class GitDiffTool(BaseGitTool):
                     "NOT_GIT_REPO", f"目录 {working_dir or 'current'} 不是 Git 仓库"
                 )
 
-            # 检查仓库状态
-            repo_status = self._check_repository_status(working_dir)
-            if repo_status["is_empty"]:
+            # 检查仓库状态：完整状态只在空仓库时返回，HEAD 可解析时无需收集
+            head_oid = self._batch_resolve_refs(["HEAD"], working_dir)["HEAD"]
+            repo_status = (
+                None if head_oid else self._check_repository_status(working_dir)
+            )
+            if repo_status is not None and repo_status["is_empty"]:
                 return self._create_success_result(
                     {
                         "has_changes": False,
@@ -179,9 +424,16 @@ class GitDiffTool(BaseGitTool):
                     }
                 )
 
-            # 执行差异分析
+            # 执行差异分析；原始差异文本只在输出格式会返回它时保留
             diff_result = self._analyze_diff(
-                target, comparison_base, analysis_level, include_context, working_dir
+                target,
+                comparison_base,
+                analysis_level,
+                include_context,
+                working_dir,
+                include_raw=include_context and output_format in _RAW_DIFF_FORMATS,
+                # mermaid 只展示各文件的增删行数，无需解析补丁内容
+                summary_only=output_format == "mermaid",
             )
 
             if not diff_result["success"]:
@@ -194,24 +446,16 @@ class GitDiffTool(BaseGitTool):
                 diff_result["data"], output_format
             )
 
-            # 存储分析结果到 ChromaDB (异步，避免超时)
-            try:
+            # 存储分析结果到 ChromaDB（后台任务，不阻塞响应）
+            task = asyncio.create_task(
                 self._store_diff_analysis(target, diff_result["data"])
-            except Exception as e:
-                self._logger.warning(f"ChromaDB存储失败，但不影响主要功能: {e}")
-
-            # 创建执行元数据
-            metadata = ExecutionMetadata(
-                execution_time=(time.time() - start_time) * 1000,  # 转换为毫秒
-                memory_used=len(str(formatted_output)) / 1024,  # KB 转 MB
-                cpu_time=(time.time() - start_time) * 1000,  # 转换为毫秒
-                io_operations=1,
             )
+            self._pending_stores.add(task)
+            task.add_done_callback(self._pending_stores.discard)
 
-            resources = ResourceUsage(
-                memory_mb=len(str(formatted_output)) / 1024 / 1024,  # 转换为 MB
-                cpu_time_ms=(time.time() - start_time) * 1000,  # 转换为毫秒
-                io_operations=1,
+            # 创建执行元数据：内存按解析的差异文本大小估算，无需序列化输出
+            metadata, resources = self._build_execution_stats(
+                start_time, diff_result.get("diff_size", 0) / 1024 / 1024
             )
 
             return self._create_success_result(formatted_output, metadata, resources)
@@ -227,8 +471,14 @@ class GitDiffTool(BaseGitTool):
         level: str,
         include_context: bool,
         cwd: Optional[str] = None,
+        include_raw: bool = False,
+        summary_only: bool = False,
     ) -> Dict[str, Any]:
-        """执行差异分析"""
+        """执行差异分析
+
+        include_raw 为 True 时在结果中附带原始差异文本；summary_only 为 True 时
+        只通过 --numstat 统计各文件增删行数，不获取和解析补丁内容
+        """
         try:
             # 智能处理比较基准
             resolved_base = self._resolve_comparison_base(base, cwd)
@@ -247,10 +497,38 @@ class GitDiffTool(BaseGitTool):
                     },
                 }
 
-            # 获取 Git diff
-            success, stdout, stderr = self._run_git_command(
-                ["diff", resolved_base, "--", target], cwd=cwd
-            )
+            # 获取 Git diff，边读取边解析；按分析级别选择 diff 算法
+            algorithm = _DIFF_ALGORITHMS.get(level, "myers")
+            parsed: Optional[Tuple[Dict[str, Any], int]]
+            if summary_only:
+                success, stdout, stderr = self._run_git_command(
+                    [
+                        "diff",
+                        f"--diff-algorithm={algorithm}",
+                        "--numstat",
+                        "-z",
+                        resolved_base,
+                        "--",
+                        target,
+                    ],
+                    cwd=cwd,
+                )
+                parsed = (self._parse_numstat(stdout), len(stdout))
+            else:
+                success, parsed, stderr = self._run_git_command_streaming(
+                    [
+                        "diff",
+                        f"--diff-algorithm={algorithm}",
+                        resolved_base,
+                        "--",
+                        target,
+                    ],
+                    lambda lines: self._parse_diff(
+                        lines, level, include_context, include_raw
+                    ),
+                    cwd=cwd,
+                    max_size=self.max_diff_size,
+                )
 
             if not success:
                 # 尝试更智能的错误处理
@@ -261,7 +539,7 @@ class GitDiffTool(BaseGitTool):
                 else:
                     return {"success": False, "error": stderr}
 
-            if not stdout.strip():
+            if parsed is None or not parsed[0]["file_changes"]:
                 return {
                     "success": True,
                     "data": {
@@ -275,38 +553,87 @@ class GitDiffTool(BaseGitTool):
                     },
                 }
 
-            # 解析差异
-            parsed_diff = self._parse_diff(stdout, level, include_context)
-
-            return {"success": True, "data": parsed_diff}
+            parsed_diff, diff_size = parsed
+            parsed_diff["diff_algorithm"] = algorithm
+            return {"success": True, "data": parsed_diff, "diff_size": diff_size}
 
         except Exception as e:
             return {"success": False, "error": str(e)}
 
+    def _parse_numstat(self, numstat_text: str) -> Dict[str, Any]:
+        """解析 git diff --numstat -z 输出，构造只含行数统计的结果"""
+        result: Dict[str, Any] = {
+            "has_changes": True,
+            "diff_summary": {"files_changed": 0, "lines_added": 0, "lines_deleted": 0},
+            "file_changes": [],
+            "raw_diff": None,
+        }
+        summary = result["diff_summary"]
+
+        fields = iter(numstat_text.split("\0"))
+        for entry in fields:
+            if not entry:
+                continue
+            added, deleted, file_path = entry.split("\t", 2)
+            if not file_path:
+                # 重命名：随后依次是旧路径和新路径
+                next(fields, "")
+                file_path = next(fields, "")
+            # 二进制文件的行数显示为 "-"
+            lines_added = int(added) if added != "-" else 0
+            lines_deleted = int(deleted) if deleted != "-" else 0
+            result["file_changes"].append(
+                {
+                    "file_path": file_path,
+                    "change_type": "modified",
+                    "hunks": [],
+                    "lines_added": lines_added,
+                    "lines_deleted": lines_deleted,
+                }
+            )
+            summary["files_changed"] += 1
+            summary["lines_added"] += lines_added
+            summary["lines_deleted"] += lines_deleted
+
+        return result
+
     def _parse_diff(
-        self, diff_text: str, level: str, include_context: bool
-    ) -> Dict[str, Any]:
-        """解析差异文本"""
-        lines = diff_text.split("\n")
+        self,
+        diff_lines: Iterable[str],
+        level: str,
+        include_context: bool,
+        include_raw: bool = False,
+    ) -> Tuple[Dict[str, Any], int]:
+        """解析差异文本，diff_lines 为带换行符的逐行输出，只遍历一次
+
+        返回解析结果与读取的差异文本字符数
+        """
         result: Dict[str, Any] = {
             "has_changes": True,
             "diff_summary": {"files_changed": 0, "lines_added": 0, "lines_deleted": 0},
             "file_changes": [],
-            "raw_diff": diff_text if include_context else None,
+            "raw_diff": None,
         }
+        raw_lines: List[str] = []
+        diff_size = 0
 
         current_file: Optional[Dict[str, Any]] = None
         current_hunk: Optional[Dict[str, Any]] = None
 
-        for line in lines:
-            if line.startswith("diff --git"):
+        for raw_line in diff_lines:
+            diff_size += len(raw_line)
+            if include_raw:
+                raw_lines.append(raw_line)
+            line = raw_line.rstrip("\n")
+            # 按首字符分派，每行最多一次前缀比较
+            c = line[:1]
+            if c == "d" and line.startswith("diff --git"):
                 # 新文件开始
                 if current_file:
                     result["file_changes"].append(current_file)
 
-                file_path = (
-                    line.split(" b/")[-1] if " b/" in line else line.split(" ")[-1]
-                )
+                _, sep, tail = line.rpartition(" b/")
+                file_path = tail if sep else line.rpartition(" ")[2]
                 current_file = {
                     "file_path": file_path,
                     "change_type": "modified",
@@ -316,13 +643,13 @@ class GitDiffTool(BaseGitTool):
                 }
                 result["diff_summary"]["files_changed"] += 1
 
-            elif line.startswith("@@"):
+            elif c == "@" and line.startswith("@@"):
                 # 新的代码块
                 if current_hunk and current_file:
                     current_file["hunks"].append(current_hunk)
 
                 # 解析行号信息
-                match = re.match(r"@@ -(\d+),?(\d*) \+(\d+),?(\d*) @@", line)
+                match = _HUNK_RE.match(line)
                 if match:
                     old_start, old_count, new_start, new_count = match.groups()
                     current_hunk = {
@@ -334,7 +661,7 @@ class GitDiffTool(BaseGitTool):
                         "context": line if include_context else None,
                     }
 
-            elif line.startswith("+") and not line.startswith("+++"):
+            elif c == "+" and not line.startswith("+++"):
                 # 新增行
                 if current_hunk:
                     current_hunk["changes"].append({"type": "add", "content": line[1:]})
@@ -342,7 +669,7 @@ class GitDiffTool(BaseGitTool):
                     current_file["lines_added"] += 1
                     result["diff_summary"]["lines_added"] += 1
 
-            elif line.startswith("-") and not line.startswith("---"):
+            elif c == "-" and not line.startswith("---"):
                 # 删除行
                 if current_hunk:
                     current_hunk["changes"].append(
@@ -352,7 +679,7 @@ class GitDiffTool(BaseGitTool):
                     current_file["lines_deleted"] += 1
                     result["diff_summary"]["lines_deleted"] += 1
 
-            elif line.startswith(" ") and current_hunk:
+            elif c == " " and current_hunk:
                 # 上下文行
                 if include_context:
                     current_hunk["changes"].append(
@@ -364,12 +691,14 @@ class GitDiffTool(BaseGitTool):
             current_file["hunks"].append(current_hunk)
         if current_file:
             result["file_changes"].append(current_file)
+        if include_raw:
+            result["raw_diff"] = "".join(raw_lines)
 
         # 语义分析增强
         if level == "semantic":
             result = self._enhance_semantic_analysis(result)
 
-        return result
+        return result, diff_size
 
     def _enhance_semantic_analysis(self, diff_data: Dict[str, Any]) -> Dict[str, Any]:
         """增强语义分析"""
@@ -389,31 +718,23 @@ class GitDiffTool(BaseGitTool):
     def _analyze_semantic_impact(self, file_change: Dict[str, Any]) -> str:
         """分析语义影响"""
         # 简单的语义分析逻辑
-        file_path = file_change["file_path"]
+        _, dot, ext = file_change["file_path"].rpartition(".")
+        category = _EXT_CATEGORIES.get(ext) if dot else None
 
-        if file_path.endswith((".py", ".js", ".ts", ".java")):
+        if category == "code":
             # 检查是否有函数签名变更
             for hunk in file_change["hunks"]:
                 for change in hunk["changes"]:
                     if change["type"] in ["add", "delete"]:
                         content = change["content"].strip()
-                        if any(
-                            keyword in content
-                            for keyword in ["def ", "function ", "class ", "interface "]
-                        ):
+                        if _SIGNATURE_RE.search(content):
                             return "function_signature_change"
-                        elif "import " in content or "from " in content:
+                        elif _IMPORT_RE.search(content):
                             return "import_change"
 
             return "code_content_change"
 
-        elif file_path.endswith((".json", ".yaml", ".yml", ".toml")):
-            return "configuration_change"
-
-        elif file_path.endswith((".md", ".txt", ".rst")):
-            return "documentation_change"
-
-        return "file_content_change"
+        return category or "file_content_change"
 
     def _assess_change_risk(self, file_change: Dict[str, Any]) -> str:
         """评估变更风险"""
@@ -506,54 +827,98 @@ class GitDiffTool(BaseGitTool):
                 "mermaid_code": "graph TD\n    A[没有变更] --> B[仓库状态正常]",
             }
 
-        mermaid_code = "graph TD\n"
+        parts = ["graph TD\n"]
 
         for i, file_change in enumerate(diff_data["file_changes"]):
             file_node = f"F{i}[{file_change['file_path']}]"
-            mermaid_code += f"    {file_node}\n"
+            parts.append(f"    {file_node}\n")
 
             if file_change["lines_added"] > 0:
                 add_node = f"A{i}[+{file_change['lines_added']} lines]"
-                mermaid_code += f"    {file_node} --> {add_node}\n"
-                mermaid_code += f"    style {add_node} fill:#90EE90\n"
+                parts.append(f"    {file_node} --> {add_node}\n")
+                parts.append(f"    style {add_node} fill:#90EE90\n")
 
             if file_change["lines_deleted"] > 0:
                 del_node = f"D{i}[-{file_change['lines_deleted']} lines]"
-                mermaid_code += f"    {file_node} --> {del_node}\n"
-                mermaid_code += f"    style {del_node} fill:#FFB6C1\n"
+                parts.append(f"    {file_node} --> {del_node}\n")
+                parts.append(f"    style {del_node} fill:#FFB6C1\n")
 
         return {
             "format": "mermaid",
             "summary": diff_data["diff_summary"],
-            "mermaid_code": mermaid_code,
+            "mermaid_code": "".join(parts),
         }
 
-    def _store_diff_analysis(self, target: str, diff_data: Dict[str, Any]) -> None:
-        """存储差异分析结果到 ChromaDB"""
+    async def _store_diff_analysis(
+        self, target: str, diff_data: Dict[str, Any]
+    ) -> None:
+        """存储差异分析结果到 ChromaDB，写入在线程中执行"""
         try:
             content = f"Git diff analysis for {target}"
             metadata = {
                 "target": target,
-                "analysis_timestamp": time.time(),
+                "analysis_timestamp": int(time.time()),  # 秒级精度足够，存为整数
                 "files_changed": diff_data["diff_summary"]["files_changed"],
                 "lines_added": diff_data["diff_summary"]["lines_added"],
                 "lines_deleted": diff_data["diff_summary"]["lines_deleted"],
                 "has_changes": diff_data["has_changes"],
             }
 
-            self.data_manager.store_data(
-                data_type="git_diff_analysis", content=content, metadata=metadata
+            await asyncio.to_thread(
+                self.data_manager.store_data,
+                data_type="git_diff_analysis",
+                content=content,
+                metadata=metadata,
             )
         except Exception as e:
             self._logger.warning(f"Failed to store diff analysis: {e}")
 
+    def _batch_resolve_refs(
+        self, candidates: List[str], cwd: Optional[str] = None
+    ) -> Dict[str, Optional[str]]:
+        """通过常驻 cat-file --batch-check 进程解析多个引用，不存在的引用映射为 None"""
+        resolved: Dict[str, Optional[str]] = dict.fromkeys(candidates)
+        # batch 协议按行分隔，含换行的候选无法表达，保持未解析
+        names = [name for name in resolved if "\n" not in name]
+        if not names:
+            return resolved
+
+        try:
+            lines = self._get_git_worker(cwd).resolve(names)
+        except OSError:
+            # 常驻进程不可用时退回一次性调用
+            success, stdout, _ = self._run_git_command(
+                ["cat-file", _BATCH_CHECK_FORMAT],
+                cwd=cwd,
+                input="\n".join(names) + "\n",
+            )
+            if not success:
+                return resolved
+            lines = stdout.split("\n")
+
+        # 每行输入对应一行输出："<oid> <type>"，或 "<name> missing"
+        for name, line in zip(names, lines):
+            line = line.rstrip("\n")
+            oid, _, object_type = line.rpartition(" ")
+            if object_type in _GIT_OBJECT_TYPES:
+                resolved[name] = oid
+        return resolved
+
     def _resolve_comparison_base(
         self, base: str, cwd: Optional[str] = None
     ) -> Optional[str]:
         """智能解析比较基准"""
+        common_branches = ["main", "master", "develop", "dev"]
+        local_branch = (
+            base.replace("origin/", "") if base.startswith("origin/") else None
+        )
+        candidates = ["HEAD", base] + common_branches
+        if local_branch is not None:
+            candidates.append(local_branch)
+        refs = self._batch_resolve_refs(candidates, cwd)
+
         # 1. 检查是否有提交
-        success, _, _ = self._run_git_command(["rev-parse", "HEAD"], cwd=cwd)
-        if not success:
+        if refs["HEAD"] is None:
             # 没有提交的新仓库
             return None
 
@@ -562,18 +927,12 @@ class GitDiffTool(BaseGitTool):
             return "HEAD"
 
         # 3. 检查指定的分支/提交是否存在
-        success, _, _ = self._run_git_command(["rev-parse", "--verify", base], cwd=cwd)
-        if success:
+        if refs[base] is not None:
             return base
 
         # 4. 如果是origin/xxx格式，尝试找到对应的本地分支
-        if base.startswith("origin/"):
-            local_branch = base.replace("origin/", "")
-            success, _, _ = self._run_git_command(
-                ["rev-parse", "--verify", local_branch], cwd=cwd
-            )
-            if success:
-                return local_branch
+        if local_branch is not None and refs[local_branch] is not None:
+            return local_branch
 
         # 5. 尝试获取默认分支
         success, stdout, _ = self._run_git_command(
@@ -581,19 +940,18 @@ class GitDiffTool(BaseGitTool):
         )
         if success and stdout.strip():
             default_branch = stdout.strip().replace("refs/remotes/origin/", "")
-            success, _, _ = self._run_git_command(
-                ["rev-parse", "--verify", default_branch], cwd=cwd
-            )
-            if success:
+            if default_branch in refs:
+                exists = refs[default_branch] is not None
+            else:
+                exists, _, _ = self._run_git_command(
+                    ["rev-parse", "--verify", default_branch], cwd=cwd
+                )
+            if exists:
                 return default_branch
 
         # 6. 尝试常见的分支名
-        common_branches = ["main", "master", "develop", "dev"]
         for branch in common_branches:
-            success, _, _ = self._run_git_command(
-                ["rev-parse", "--verify", branch], cwd=cwd
-            )
-            if success:
+            if refs[branch] is not None:
                 return branch
 
         # 7. 最后尝试HEAD
@@ -683,7 +1041,14 @@ class GitDiffTool(BaseGitTool):
 
     async def cleanup(self) -> None:
         """清理资源"""
-        pass
+        if self._pending_stores:
+            _, pending = await asyncio.wait(
+                self._pending_stores, timeout=_STORE_DRAIN_TIMEOUT
+            )
+            for task in pending:
+                task.cancel()
+        self._close_git_workers()
+        self._git_repo_dirs.clear()
 
 
 class GitPatchTool(BaseGitTool):
@@ -751,7 +1116,7 @@ class GitPatchTool(BaseGitTool):
 
     async def execute(self, request: ToolExecutionRequest) -> ToolExecutionResult:
         """执行补丁应用"""
-        start_time = time.time()
+        start_time = time.monotonic()
         params = request.parameters
 
         try:
@@ -774,9 +1139,12 @@ class GitPatchTool(BaseGitTool):
                     "READ_ERROR", f"无法读取文件: {file_path}"
                 )
 
+            # 只拆分一次行列表，验证与应用共用
+            lines = original_content.split("\n")
+
             # 验证补丁操作
             validation_result = self._validate_patch_operations(
-                original_content, patch_operations, verify_context
+                lines, patch_operations, verify_context
             )
 
             if not validation_result["valid"]:
@@ -786,7 +1154,7 @@ class GitPatchTool(BaseGitTool):
 
             # 应用补丁
             patch_result = self._apply_patch_operations(
-                original_content, patch_operations, dry_run
+                lines, patch_operations, dry_run
             )
 
             if not patch_result["success"]:
@@ -823,16 +1191,9 @@ class GitPatchTool(BaseGitTool):
                 result_data["preview_content"] = patch_result["content"]
 
             # 创建执行元数据
-            metadata = ExecutionMetadata(
-                execution_time=(time.time() - start_time) * 1000,  # 转换为毫秒
-                memory_used=len(patch_result["content"]) / 1024 / 1024,  # 转换为 MB
-                cpu_time=(time.time() - start_time) * 1000,  # 转换为毫秒
-                io_operations=2 if not dry_run else 1,
-            )
-
-            resources = ResourceUsage(
-                memory_mb=len(patch_result["content"]) / 1024 / 1024,  # 转换为 MB
-                cpu_time_ms=(time.time() - start_time) * 1000,  # 转换为毫秒
+            metadata, resources = self._build_execution_stats(
+                start_time,
+                len(patch_result["content"]) / 1024 / 1024,  # 转换为 MB
                 io_operations=2 if not dry_run else 1,
             )
 
@@ -843,10 +1204,9 @@ class GitPatchTool(BaseGitTool):
             return self._create_error_result("EXECUTION_ERROR", f"执行异常: {str(e)}")
 
     def _validate_patch_operations(
-        self, content: str, operations: List[Dict[str, Any]], verify_context: bool
+        self, lines: List[str], operations: List[Dict[str, Any]], verify_context: bool
     ) -> Dict[str, Any]:
         """验证补丁操作"""
-        lines = content.split("\n")
         total_lines = len(lines)
 
         for i, op in enumerate(operations):
@@ -891,52 +1251,75 @@ class GitPatchTool(BaseGitTool):
         start_line = max(0, line_number - context_lines - 1)
         end_line = min(len(lines), line_number + context_lines)
 
-        actual_context = "\n".join(lines[start_line:end_line])
-        return expected_context.strip() in actual_context
+        expected = expected_context.strip()
+        if not expected:
+            return True
+        if "\n" in expected:
+            return expected in "\n".join(lines[start_line:end_line])
+        # 单行上下文不会跨行匹配，逐行查找即可，无需拼接
+        return any(expected in line for line in lines[start_line:end_line])
 
     def _apply_patch_operations(
-        self, content: str, operations: List[Dict[str, Any]], dry_run: bool
+        self, lines: List[str], operations: List[Dict[str, Any]], dry_run: bool
     ) -> Dict[str, Any]:
-        """应用补丁操作"""
+        """应用补丁操作，直接修改传入的行列表"""
         try:
-            lines = content.split("\n")
             changes_summary = {
                 "lines_inserted": 0,
                 "lines_deleted": 0,
                 "lines_modified": 0,
             }
 
-            # 按行号排序操作（从后往前处理，避免行号偏移）
+            # 按行号排序操作（从后往前处理，避免行号偏移；同一行号保持原有顺序）
             sorted_operations = sorted(
                 operations, key=lambda x: x["line_number"], reverse=True
             )
 
+            # lines 只保留尚未处理的前缀，已处理的尾部逆序存放在 rev_tail 中，
+            # 当前行位于 rev_tail 末尾，插入和删除不再整体移动后续行
+            rev_tail: List[str] = []
+            leading_inserts: List[Dict[str, Any]] = []
+
             for op in sorted_operations:
                 operation = op["operation"]
                 line_number = op["line_number"]
                 content_text = op.get("content", "")
+                index = line_number - 1
+
+                if index < 0:
+                    # 非正行号排在最后，只有插入会生效，合并后再处理
+                    leading_inserts.append(op)
+                    continue
+
+                if index < len(lines):
+                    rev_tail.extend(reversed(lines[index:]))
+                    del lines[index:]
+                # 目标行在尾部中的偏移，通常为 0
+                offset = index - len(lines)
 
                 if operation == "insert":
-                    # 插入行
-                    if line_number <= len(lines):
-                        lines.insert(line_number - 1, content_text)
-                        changes_summary["lines_inserted"] += 1
-                    else:
-                        lines.append(content_text)
-                        changes_summary["lines_inserted"] += 1
+                    # 插入行，超出末尾时追加
+                    rev_tail.insert(max(len(rev_tail) - offset, 0), content_text)
+                    changes_summary["lines_inserted"] += 1
 
                 elif operation == "delete":
                     # 删除行
-                    if 1 <= line_number <= len(lines):
-                        lines.pop(line_number - 1)
+                    if offset < len(rev_tail):
+                        del rev_tail[len(rev_tail) - 1 - offset]
                         changes_summary["lines_deleted"] += 1
 
                 elif operation == "replace":
                     # 替换行
-                    if 1 <= line_number <= len(lines):
-                        lines[line_number - 1] = content_text
+                    if offset < len(rev_tail):
+                        rev_tail[len(rev_tail) - 1 - offset] = content_text
                         changes_summary["lines_modified"] += 1
 
+            lines.extend(reversed(rev_tail))
+            for op in leading_inserts:
+                if op["operation"] == "insert":
+                    lines.insert(op["line_number"] - 1, op.get("content", ""))
+                    changes_summary["lines_inserted"] += 1
+
             modified_content = "\n".join(lines)
 
             return {
@@ -970,7 +1353,7 @@ class GitPatchTool(BaseGitTool):
 
     async def cleanup(self) -> None:
         """清理资源"""
-        pass
+        self._git_repo_dirs.clear()
 
 
 class GitHistoryTool(BaseGitTool):
@@ -1031,7 +1414,7 @@ class GitHistoryTool(BaseGitTool):
 
     async def execute(self, request: ToolExecutionRequest) -> ToolExecutionResult:
         """执行历史分析"""
-        start_time = time.time()
+        start_time = time.monotonic()
         params = request.parameters
 
         try:
@@ -1069,17 +1452,8 @@ class GitHistoryTool(BaseGitTool):
             self._store_history_analysis(target, history_result["data"])
 
             # 创建执行元数据
-            metadata = ExecutionMetadata(
-                execution_time=(time.time() - start_time) * 1000,  # 转换为毫秒
-                memory_used=len(str(history_result["data"])) / 1024 / 1024,  # 转换为 MB
-                cpu_time=(time.time() - start_time) * 1000,  # 转换为毫秒
-                io_operations=1,
-            )
-
-            resources = ResourceUsage(
-                memory_mb=len(str(history_result["data"])) / 1024 / 1024,  # 转换为 MB
-                cpu_time_ms=(time.time() - start_time) * 1000,  # 转换为毫秒
-                io_operations=1,
+            metadata, resources = self._build_execution_stats(
+                start_time, len(str(history_result["data"])) / 1024 / 1024
             )
 
             return self._create_success_result(
@@ -1130,6 +1504,14 @@ class GitHistoryTool(BaseGitTool):
             "--pretty=format:%H|%an|%ae|%ad|%s",
             "--date=iso",
         ]
+        if include_diffs:
+            # 一次 git log -p 同时取得提交信息和差异，提交之间以分隔符隔开；
+            # --cc 与 git show 一致，输出合并提交的组合差异
+            cmd[2:3] = [
+                "-p",
+                "--cc",
+                f"--pretty=format:{_COMMIT_SEPARATOR}%H|%an|%ae|%ad|%s",
+            ]
 
         # 添加时间范围
         if time_range.get("since"):
@@ -1141,34 +1523,14 @@ class GitHistoryTool(BaseGitTool):
         if target != ".":
             cmd.extend(["--", target])
 
-        success, stdout, stderr = self._run_git_command(cmd)
+        consume = (
+            self._collect_commits_with_diffs if include_diffs else self._collect_commits
+        )
+        success, commits, stderr = self._run_git_command_streaming(cmd, consume)
 
-        if not success:
+        if not success or commits is None:
             return {"success": False, "error": stderr}
 
-        commits = []
-        for line in stdout.strip().split("\n"):
-            if line:
-                parts = line.split("|", 4)
-                if len(parts) == 5:
-                    commit_hash, author_name, author_email, date, message = parts
-                    commit_data = {
-                        "hash": commit_hash,
-                        "author": {"name": author_name, "email": author_email},
-                        "date": date,
-                        "message": message,
-                    }
-
-                    # 如果需要包含差异
-                    if include_diffs:
-                        diff_success, diff_stdout, _ = self._run_git_command(
-                            ["show", "--pretty=format:", commit_hash, "--", target]
-                        )
-                        if diff_success:
-                            commit_data["diff"] = diff_stdout
-
-                    commits.append(commit_data)
-
         return {
             "success": True,
             "data": {
@@ -1179,6 +1541,54 @@ class GitHistoryTool(BaseGitTool):
             },
         }
 
+    def _collect_commits(self, lines: Iterable[str]) -> List[Dict[str, Any]]:
+        """逐行解析 git log 输出的提交信息"""
+        commits = []
+        for line in lines:
+            commit_data = self._parse_commit_header(line.rstrip("\n"))
+            if commit_data is not None:
+                commits.append(commit_data)
+        return commits
+
+    def _collect_commits_with_diffs(self, lines: Iterable[str]) -> List[Dict[str, Any]]:
+        """逐行解析 git log -p 输出，提交记录以分隔符开头的信息行起始"""
+        commits: List[Dict[str, Any]] = []
+        current: Optional[Dict[str, Any]] = None
+        diff_lines: List[str] = []
+
+        def _finish(is_last: bool) -> None:
+            if current is None:
+                return
+            diff = "".join(diff_lines)
+            # 去掉提交之间的空行分隔符，与单独 git show 的输出保持一致
+            if not is_last and diff.endswith("\n"):
+                diff = diff[:-1]
+            current["diff"] = diff
+            commits.append(current)
+
+        for line in lines:
+            if line.startswith(_COMMIT_SEPARATOR):
+                _finish(is_last=False)
+                current = self._parse_commit_header(line[1:].rstrip("\n"))
+                diff_lines = []
+            elif current is not None:
+                diff_lines.append(line)
+        _finish(is_last=True)
+        return commits
+
+    def _parse_commit_header(self, line: str) -> Optional[Dict[str, Any]]:
+        """解析 %H|%an|%ae|%ad|%s 格式的提交信息行"""
+        parts = line.split("|", 4)
+        if len(parts) != 5:
+            return None
+        commit_hash, author_name, author_email, date, message = parts
+        return {
+            "hash": commit_hash,
+            "author": {"name": author_name, "email": author_email},
+            "date": date,
+            "message": message,
+        }
+
     def _analyze_file_changes(
         self, target: str, time_range: Dict[str, str], max_results: int
     ) -> Dict[str, Any]:
@@ -1199,38 +1609,44 @@ class GitHistoryTool(BaseGitTool):
         if target != ".":
             cmd.extend(["--", target])
 
-        success, stdout, stderr = self._run_git_command(cmd)
+        success, changes, stderr = self._run_git_command_streaming(
+            cmd, self._collect_file_changes
+        )
 
-        if not success:
+        if not success or changes is None:
             return {"success": False, "error": stderr}
 
+        return {
+            "success": True,
+            "data": {
+                "analysis_type": "file_changes",
+                "target": target,
+                "total_changes": len(changes),
+                "changes": changes,
+            },
+        }
+
+    def _collect_file_changes(self, lines: Iterable[str]) -> List[Dict[str, Any]]:
+        """逐行解析 git log --name-status 输出"""
         changes: List[Dict[str, Any]] = []
         current_commit: Optional[Dict[str, Any]] = None
 
-        for line in stdout.strip().split("\n"):
+        for line in lines:
+            line = line.strip()
             if "|" in line:
                 # 提交信息行
                 commit_hash, date = line.split("|", 1)
                 current_commit = {"hash": commit_hash, "date": date, "files": []}
                 changes.append(current_commit)
-            elif line.strip() and current_commit:
+            elif line and current_commit:
                 # 文件变更行
-                parts = line.strip().split("\t")
+                parts = line.split("\t")
                 if len(parts) >= 2:
                     status, file_path = parts[0], parts[1]
                     current_commit["files"].append(
                         {"status": status, "path": file_path}
                     )
-
-        return {
-            "success": True,
-            "data": {
-                "analysis_type": "file_changes",
-                "target": target,
-                "total_changes": len(changes),
-                "changes": changes,
-            },
-        }
+        return changes
 
     def _analyze_function_evolution(
         self, target: str, time_range: Dict[str, str], max_results: int
@@ -1261,19 +1677,13 @@ class GitHistoryTool(BaseGitTool):
         if target != ".":
             cmd.extend(["--", target])
 
-        success, stdout, stderr = self._run_git_command(cmd)
+        success, authors, stderr = self._run_git_command_streaming(
+            cmd, self._collect_author_stats
+        )
 
-        if not success:
+        if not success or authors is None:
             return {"success": False, "error": stderr}
 
-        authors = []
-        for line in stdout.strip().split("\n"):
-            if line.strip():
-                parts = line.strip().split("\t", 1)
-                if len(parts) == 2:
-                    commit_count, author_name = parts
-                    authors.append({"name": author_name, "commits": int(commit_count)})
-
         return {
             "success": True,
             "data": {
@@ -1284,6 +1694,16 @@ class GitHistoryTool(BaseGitTool):
             },
         }
 
+    def _collect_author_stats(self, lines: Iterable[str]) -> List[Dict[str, Any]]:
+        """逐行解析 git shortlog -sn 输出"""
+        authors = []
+        for line in lines:
+            parts = line.strip().split("\t", 1)
+            if len(parts) == 2:
+                commit_count, author_name = parts
+                authors.append({"name": author_name, "commits": int(commit_count)})
+        return authors
+
     def _store_history_analysis(self, target: str, data: Dict[str, Any]) -> None:
         """存储历史分析结果"""
         try:
@@ -1305,7 +1725,7 @@ class GitHistoryTool(BaseGitTool):
 
     async def cleanup(self) -> None:
         """清理资源"""
-        pass
+        self._git_repo_dirs.clear()
 
 
 class GitConflictTool(BaseGitTool):
@@ -1345,7 +1765,7 @@ class GitConflictTool(BaseGitTool):
 
     async def execute(self, request: ToolExecutionRequest) -> ToolExecutionResult:
         """执行冲突检查"""
-        start_time = time.time()
+        start_time = time.monotonic()
         params = request.parameters
 
         try:
@@ -1374,19 +1794,8 @@ class GitConflictTool(BaseGitTool):
             self._store_conflict_check(target, conflict_result["data"])
 
             # 创建执行元数据
-            metadata = ExecutionMetadata(
-                execution_time=(time.time() - start_time) * 1000,  # 转换为毫秒
-                memory_used=len(str(conflict_result["data"]))
-                / 1024
-                / 1024,  # 转换为 MB
-                cpu_time=(time.time() - start_time) * 1000,  # 转换为毫秒
-                io_operations=1,
-            )
-
-            resources = ResourceUsage(
-                memory_mb=len(str(conflict_result["data"])) / 1024 / 1024,  # 转换为 MB
-                cpu_time_ms=(time.time() - start_time) * 1000,  # 转换为毫秒
-                io_operations=1,
+            metadata, resources = self._build_execution_stats(
+                start_time, len(str(conflict_result["data"])) / 1024 / 1024
             )
 
             return self._create_success_result(
@@ -1465,21 +1874,16 @@ class GitConflictTool(BaseGitTool):
             return {"success": False, "error": "无法获取 Git 状态"}
 
         conflicts = []
-        for line in status_output.split("\n"):
-            if (
-                line.startswith("UU ")
-                or line.startswith("AA ")
-                or line.startswith("DD ")
-            ):
-                file_path = line[3:].strip()
-                if target == "." or file_path == target:
-                    conflicts.append(
-                        {
-                            "file": file_path,
-                            "status": line[:2],
-                            "type": "merge_conflict",
-                        }
-                    )
+        for match in _CONFLICT_STATUS_RE.finditer(status_output):
+            file_path = match.group(2).strip()
+            if target == "." or file_path == target:
+                conflicts.append(
+                    {
+                        "file": file_path,
+                        "status": match.group(1),
+                        "type": "merge_conflict",
+                    }
+                )
 
         result = {
             "check_type": "existing",
@@ -1521,23 +1925,22 @@ class GitConflictTool(BaseGitTool):
             return conflicts
 
         # 简单的冲突检测逻辑
-        lines = diff_output.split("\n")
         current_file = None
 
-        for line in lines:
-            if line.startswith("diff --git"):
-                current_file = line.split(" b/")[-1] if " b/" in line else target
-            elif line.startswith("@@"):
+        for match in _DIFF_ANCHOR_RE.finditer(diff_output):
+            header, hunk = match.groups()
+            if header is not None:
+                current_file = header.split(" b/")[-1] if " b/" in header else target
+            elif current_file:
                 # 检测到修改区域，可能存在冲突
-                if current_file:
-                    conflicts.append(
-                        {
-                            "file": current_file,
-                            "type": "modification_overlap",
-                            "description": "两个分支都修改了相同区域",
-                            "line_info": line,
-                        }
-                    )
+                conflicts.append(
+                    {
+                        "file": current_file,
+                        "type": "modification_overlap",
+                        "description": "两个分支都修改了相同区域",
+                        "line_info": hunk,
+                    }
+                )
 
         return conflicts
 
@@ -1603,7 +2006,7 @@ class GitConflictTool(BaseGitTool):
 
     async def cleanup(self) -> None:
         """清理资源"""
-        pass
+        self._git_repo_dirs.clear()
 
 
 class GitIntegrationTools: